@@ -1,12 +1,40 @@
 import uvicorn
 from fastapi import FastAPI
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel
-import datetime
+import gzip
+import hashlib
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
+from archive import GameArchive
+from appkit.assets import pick_encoding
+from appkit.metrics import Metrics, MetricsMiddleware
+from appkit.routes import metrics_router
+
+try:
+    # optional: without it the page is served gzip-compressed or plain
+    import brotli
+except ImportError:
+    brotli = None
+
+# request latency and counts, served at /metrics
+metrics = Metrics()
+# saved games; HEX_ARCHIVE_DIR=<dir> moves them out of ~/Downloads/hex-archive
+archive = GameArchive(os.environ.get("HEX_ARCHIVE_DIR") or Path.home() / "Downloads" / "hex-archive")
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    archive.start()
+    yield
+    await archive.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+app.include_router(metrics_router(metrics))
 
 class SaveRequest(BaseModel):
     moves: str
@@ -1032,23 +1060,62 @@ HTML_TEMPLATE = """
 
 @app.post("/save")
 async def save_game(request: SaveRequest):
-    timestamp = datetime.datetime.now().strftime("%y%m%d%H%M%S")
-    filename = f"HEX{timestamp}.txt"
-    downloads_dir = Path.home() / "Downloads"
     try:
-        downloads_dir.mkdir(parents=True, exist_ok=True)
-        filepath = downloads_dir / filename
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(request.moves)
-        return {"status": "success", "filename": str(filepath)}
+        entry = await archive.save(request.moves)
+    except ValueError as e:
+        return JSONResponse({"status": "error", "error": str(e)}, status_code=400)
     except Exception as e:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(request.moves)
-        return {"status": "success", "filename": filename, "warning": str(e)}
+        return JSONResponse({"status": "error", "error": str(e)}, status_code=500)
+    return {"status": "success", "id": entry["id"], "filename": str(archive.path(entry))}
+
+@app.get("/games")
+async def list_games(limit: int | None = None):
+    return {"games": archive.recent(limit)}
+
+@app.get("/games/{game_id}")
+async def get_saved_game(game_id: str):
+    entry = archive.get(game_id)
+    if entry is None:
+        return JSONResponse({"error": "Unknown game id"}, status_code=404)
+    return FileResponse(archive.path(entry), media_type="text/plain", filename=entry["filename"])
+
+# The page never changes while the server runs: render it once, compress
+# each encoding once, and let browsers revalidate it with the ETag.
+PAGE = HTML_TEMPLATE.format(css_content=CSS, js_content=JS).encode("utf-8")
+PAGE_HASH = hashlib.sha256(PAGE).hexdigest()[:32]
+# encoding -> (body, strong ETag); each encoding is its own representation,
+# so each gets its own ETag
+PAGE_VARIANTS = {"identity": (PAGE, f'"{PAGE_HASH}"')}
+PAGE_VARIANTS["gzip"] = (gzip.compress(PAGE, compresslevel=9, mtime=0), f'"{PAGE_HASH}-gzip"')
+if brotli is not None:
+    PAGE_VARIANTS["br"] = (brotli.compress(PAGE, quality=11), f'"{PAGE_HASH}-br"')
+# smallest first when the client likes several equally
+PAGE_PREFERENCE = ("br", "gzip", "identity")
+
+
+def page_response(encoding: str, status_code: int = 200) -> Response:
+    body, etag = PAGE_VARIANTS[encoding]
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    if status_code == 304:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html; charset=utf-8", headers=headers)
+
 
 @app.get("/", response_class=HTMLResponse)
-async def get_game():
-    return HTML_TEMPLATE.format(css_content=CSS, js_content=JS)
+async def get_game(request: Request):
+    encoding = pick_encoding(
+        request.headers.get("accept-encoding", ""), [coding for coding in PAGE_PREFERENCE if coding in PAGE_VARIANTS]
+    )
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        # a cached copy in another encoding is not the one this client
+        # would be sent now, so only the selected variant's ETag revalidates
+        if "*" in tags or PAGE_VARIANTS[encoding][1] in tags:
+            return page_response(encoding, 304)
+    return page_response(encoding)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8008)
@@ -0,0 +1,147 @@
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import secrets
+from pathlib import Path
+
+
+# Saved games, one HEX<id>.txt file of comma-separated moves each (the
+# format hex's import_moves.py reads), plus index.jsonl: one line per game,
+# loaded into memory at startup so listing and lookups never scan the
+# directory.
+
+INDEX = "index.jsonl"
+
+
+class GameArchive:
+    """Saves games from a background writer, a batch at a time.
+
+    `save` queues the moves and waits for the writer; the writer takes
+    whatever has queued up (at most `max_batch` games), writes every file,
+    then fsyncs them, the index and the directory once per batch, so a
+    burst of saves shares its disk flushes.
+    """
+
+    def __init__(self, directory: str | Path, max_batch: int = 64):
+        self.directory = Path(directory)
+        self.max_batch = max_batch
+        # ids: save time, a per-process node and a counter, so saves in the
+        # same second, or from several workers, never collide
+        self._node = secrets.token_hex(2)
+        self._counter = itertools.count(1)
+        self._index: dict[str, dict] = {}
+        self._queue: asyncio.Queue[tuple[dict, str, asyncio.Future]] | None = None
+        self._writer: asyncio.Task | None = None
+
+    def _load_index(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(self.directory / INDEX, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # a torn last line from a crash mid-append
+                        continue
+                    self._index[entry["id"]] = entry
+        except FileNotFoundError:
+            pass
+
+    def start(self):
+        self._load_index()
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Write out everything still queued, then stop the writer."""
+        if self._writer is None:
+            return
+        await self._queue.join()
+        self._writer.cancel()
+        self._writer = None
+
+    def new_id(self) -> str:
+        stamp = datetime.datetime.now().strftime("%y%m%d%H%M%S")
+        return f"{stamp}-{self._node}{next(self._counter):04d}"
+
+    async def save(self, moves: str) -> dict:
+        """Archive `moves`; returns the index entry once it is on disk.
+
+        Raises ValueError, before anything is queued, for moves the file
+        cannot hold (text that is not valid UTF-8, such as a lone surrogate).
+        """
+        try:
+            moves.encode("utf-8")
+        except UnicodeEncodeError as e:
+            raise ValueError(f"moves are not valid text: {e.reason}") from e
+        game_id = self.new_id()
+        entry = {
+            "id": game_id,
+            "filename": f"HEX{game_id}.txt",
+            "moves": len([m for m in moves.split(",") if m.strip()]),
+            "savedAt": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((entry, moves, done))
+        await done
+        return entry
+
+    def recent(self, limit: int | None = None) -> list[dict]:
+        """Index entries, newest first."""
+        entries = list(reversed(self._index.values()))
+        return entries[:limit] if limit is not None else entries
+
+    def get(self, game_id: str) -> dict | None:
+        return self._index.get(game_id)
+
+    def path(self, entry: dict) -> Path:
+        return self.directory / entry["filename"]
+
+    def _write_batch(self, batch: list[tuple[dict, str]]):
+        files = []
+        try:
+            for entry, moves in batch:
+                f = open(self.path(entry), "w", encoding="utf-8")
+                files.append(f)
+                f.write(moves)
+                f.flush()
+            for f in files:
+                os.fsync(f.fileno())
+        finally:
+            for f in files:
+                f.close()
+
+        with open(self.directory / INDEX, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry, separators=(",", ":")) + "\n" for entry, _ in batch)
+            f.flush()
+            os.fsync(f.fileno())
+        # the new directory entries themselves
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_batch, [(entry, moves) for entry, moves, _ in batch])
+            except Exception as e:
+                # whatever went wrong, every save in the batch hears about it
+                # rather than waiting forever on a writer that moved on
+                for _, _, done in batch:
+                    if not done.done():
+                        done.set_exception(e)
+            else:
+                for entry, _, done in batch:
+                    self._index[entry["id"]] = entry
+                    if not done.done():
+                        done.set_result(None)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
@@ -0,0 +1 @@
+"""Pieces shared by the apps in this repo, each of which depends on this package by path."""
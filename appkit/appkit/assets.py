@@ -0,0 +1,165 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Sequence
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    # optional: without it only .gz siblings are written
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# At startup every file under static/ is copied into a build directory
+# twice: under its own name, for links that are not versioned, and under a
+# name carrying a hash of its content ("js/hex.3f9a0c1d2e4b.js"). Text
+# assets also get .gz / .br siblings compressed once, at the highest level.
+# A fingerprinted name never changes content, so it is served with an
+# immutable one-year cache and a repeat visit sends no static bytes at all.
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE = {".css", ".html", ".js", ".json", ".map", ".svg", ".txt"}
+# smallest first: the first one the client accepts is served
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _fingerprint(path: str, data: bytes) -> str:
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def _write(path: str, data: bytes, overwrite: bool):
+    # workers building at the same time write whole files under a private
+    # name first, so none of them ever serves half a file
+    if not overwrite and os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _compress(data: bytes) -> dict[str, bytes]:
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    # not worth a Content-Encoding when it saves nothing
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+def build_assets(source: str, target: str) -> dict[str, str]:
+    """Fingerprint and pre-compress every file under `source` into `target`.
+
+    Returns the manifest: path relative to `source` -> fingerprinted path,
+    both with "/" separators.
+    """
+    manifest = {}
+    for dirpath, _, filenames in os.walk(source):
+        for filename in filenames:
+            full = os.path.join(dirpath, filename)
+            path = os.path.relpath(full, source).replace(os.sep, "/")
+            with open(full, "rb") as f:
+                data = f.read()
+            hashed = _fingerprint(path, data)
+            manifest[path] = hashed
+
+            # content-addressed files are only written once
+            _write(os.path.join(target, path), data, overwrite=True)
+            _write(os.path.join(target, hashed), data, overwrite=False)
+            if os.path.splitext(path)[1] in COMPRESSIBLE:
+                variants = _compress(data)
+                for encoding, suffix in ENCODINGS:
+                    if encoding in variants:
+                        _write(os.path.join(target, hashed + suffix), variants[encoding], overwrite=False)
+    return manifest
+
+
+def pick_encoding(accept_encoding: str, offered: Sequence[str]) -> str:
+    """The encoding in `offered` the client likes best, by q-value then order.
+
+    `offered` lists the encodings on hand, preferred (smallest) first;
+    "identity" wins when nothing offered is acceptable.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    star = weights.get("*")
+    best, best_q = "identity", -1.0
+    for coding in offered:
+        q = weights.get(coding, star if star is not None else (1.0 if coding == "identity" else 0.0))
+        if q > best_q and q > 0:
+            best, best_q = coding, q
+    return best
+
+
+class AssetFiles(StaticFiles):
+    """StaticFiles for a build directory: fingerprinted files are served
+    pre-compressed when the client accepts it, and cached for good."""
+
+    def __init__(self, directory: str, manifest: dict[str, str]):
+        super().__init__(directory=directory)
+        # fingerprinted file -> [(encoding, path, stat)] of its siblings, plus
+        # its media type; resolved once here so requests make no extra syscalls
+        self._variants: dict[str, tuple[str, list[tuple[str, str, os.stat_result]]]] = {}
+        for hashed in manifest.values():
+            full = os.path.realpath(os.path.join(directory, hashed))
+            media_type = mimetypes.guess_type(hashed)[0] or "application/octet-stream"
+            siblings = []
+            for encoding, suffix in ENCODINGS:
+                if os.path.exists(full + suffix):
+                    siblings.append((encoding, full + suffix, os.stat(full + suffix)))
+            self._variants[full] = (media_type, siblings)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        variants = self._variants.get(os.path.realpath(full_path))
+        if variants is None:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        media_type, siblings = variants
+        if siblings:
+            offered = [encoding for encoding, _, _ in siblings] + ["identity"]
+            chosen = pick_encoding(Headers(scope=scope).get("accept-encoding", ""), offered)
+        else:
+            chosen = "identity"
+        for encoding, path, stat in siblings:
+            if encoding == chosen:
+                response = super().file_response(path, stat, scope, status_code)
+                response.headers["content-type"] = media_type
+                response.headers["content-encoding"] = encoding
+                break
+        else:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+        if siblings:
+            response.headers["vary"] = "Accept-Encoding"
+        response.headers["cache-control"] = IMMUTABLE
+        return response
+
+
+class Assets:
+    """The built static directory and the URLs templates link to."""
+
+    def __init__(self, source: str, target: str, prefix: str = "/static"):
+        self.target = target
+        self.prefix = prefix.rstrip("/")
+        self.manifest = build_assets(source, target)
+
+    def url(self, path: str) -> str:
+        """URL of static file `path` (relative to the source directory), fingerprinted when known."""
+        return f"{self.prefix}/{self.manifest.get(path, path)}"
+
+    def files(self) -> AssetFiles:
+        return AssetFiles(self.target, self.manifest)
@@ -0,0 +1,248 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+# Counters, gauges and histograms kept in plain Python and rendered in the
+# Prometheus text format (version 0.0.4). Recording is a lock, a bisect and
+# two additions, cheap enough for every request.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; dense at the low end, where most requests and engine calls land
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Gauge(Metric):
+    """A value that goes up and down, or is read from `function` at render time.
+
+    `function` returns a number, or a {label tuple: number} dict when the
+    gauge has labels.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float | dict[tuple, float]] | None = None,
+    ):
+        super().__init__(name, help, labelnames)
+        self.function = function
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def samples(self) -> Iterator[str]:
+        if self.function is not None:
+            value = self.function()
+            values = list(value.items()) if isinstance(value, dict) else [((), value)]
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one +Inf, not cumulative), sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Metrics:
+    """The metrics of one app, rendered together by `render`.
+
+    Asking twice for the same name returns the metric registered first, so
+    middleware built more than once shares its series.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float | dict[tuple, float]] | None = None,
+    ) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, function))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware: latency histogram and count per route, plus requests in flight.
+
+    Requests are labelled by route template ("/ws/{game_id}", not the
+    concrete path) so the number of series stays bounded; paths no route
+    matched share the "unmatched" label. WebSocket connections are only
+    counted while open.
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.latency = metrics.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")
+        )
+        self.requests = metrics.counter(
+            "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")
+        )
+        self.in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests being handled.")
+        self.sockets = metrics.gauge("websocket_connections", "Open WebSocket connections.")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            self.sockets.inc()
+            try:
+                return await self.app(scope, receive, send)
+            finally:
+                self.sockets.dec()
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight.dec()
+            # the router stores the matched route in the scope it was handed
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.latency.observe(elapsed, scope["method"], route)
+            self.requests.inc(scope["method"], route, status)
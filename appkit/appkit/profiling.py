@@ -0,0 +1,157 @@
+import asyncio
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs
+
+
+# Opt-in profiling of single requests. A request that sends `X-Profile: 1`
+# or `?profile=1` runs under a sampling profiler and its stacks are saved in
+# the collapsed format (`thread;outer;...;inner count` per line) read by
+# flamegraph.pl, speedscope and friends. The middleware is only installed
+# when profiling is switched on, so with it off requests pay nothing.
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_PARAM = "profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+_PROFILE_ID = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$")
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stack of every other thread each `interval` seconds.
+
+    Samples every thread, not only the one handling the request: the event
+    loop, and the executor threads it hands work to, are shared, so stacks
+    from concurrent requests show up too (under their own thread names).
+    A busy thread only lets the sampler in every switch interval, so
+    sampling faster than that gains nothing.
+    """
+
+    def __init__(self, interval: float | None = None):
+        self.interval = interval or sys.getswitchinterval()
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def _run(self):
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                name = names.get(ident)
+                if name is None:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                    name = names.get(ident, str(ident))
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.append(name)
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+class ProfileStore:
+    """Collapsed-stack files in `directory`, newest `keep` kept."""
+
+    def __init__(self, directory: str, keep: int = 100):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    def new_id(self) -> str:
+        return time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(4)
+
+    def path(self, profile_id: str) -> str | None:
+        """Where profile `profile_id` is stored, None for ids this store never hands out."""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        return os.path.join(self.directory, profile_id + ".collapsed")
+
+    def save(self, profile_id: str, samples: Counter[str]):
+        lines = [f"{stack} {count}\n" for stack, count in samples.most_common()]
+        with open(self.path(profile_id), "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        self._prune()
+
+    def list(self) -> list[dict]:
+        """Stored profiles, newest first."""
+        profiles = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                profile_id = entry.name.removesuffix(".collapsed")
+                if entry.name.endswith(".collapsed") and _PROFILE_ID.match(profile_id):
+                    profiles.append({"id": profile_id, "bytes": entry.stat().st_size})
+        # ids start with their timestamp
+        profiles.sort(key=lambda p: p["id"], reverse=True)
+        return profiles
+
+    def _prune(self):
+        for profile in self.list()[self.keep:]:
+            try:
+                os.remove(self.path(profile["id"]))
+            except FileNotFoundError:
+                pass
+
+
+class ProfilerMiddleware:
+    """ASGI middleware: profiles HTTP requests that ask for it, see module notes.
+
+    The profile's id is sent back in an `X-Profile-Id` response header.
+    A request that finishes before the first sample (one switch interval)
+    leaves nothing to save, so that id is never stored.
+    """
+
+    def __init__(self, app, store: ProfileStore, interval: float | None = None):
+        self.app = app
+        self.store = store
+        self.interval = interval
+
+    @staticmethod
+    def _wanted(scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return value not in (b"", b"0")
+        query = scope["query_string"]
+        if PROFILE_PARAM.encode() not in query:
+            return False
+        return parse_qs(query.decode("latin-1")).get(PROFILE_PARAM, ["0"])[-1] not in ("", "0")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            return await self.app(scope, receive, send)
+
+        profile_id = self.store.new_id()
+
+        async def send_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]}
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_profile_id)
+        finally:
+            # joining the sampler waits at most one interval; the write is disk
+            samples = await asyncio.to_thread(sampler.stop)
+            if samples:
+                await asyncio.to_thread(self.store.save, profile_id, samples)
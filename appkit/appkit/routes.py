@@ -0,0 +1,49 @@
+import os
+
+from fastapi import APIRouter
+from fastapi.responses import FileResponse, JSONResponse, Response
+
+from .metrics import CONTENT_TYPE, Metrics
+from .profiling import ProfileStore
+
+
+# Endpoints every app serves the same way; each app includes the routers
+# with its own objects, e.g. app.include_router(metrics_router(metrics)).
+
+
+def metrics_router(metrics: Metrics) -> APIRouter:
+    """GET /metrics: `metrics` in the Prometheus text format."""
+    router = APIRouter()
+
+    @router.get("/metrics")
+    async def metrics_text():
+        """Request and engine metrics of this process, in the Prometheus text format."""
+        return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+    return router
+
+
+def profiles_router(store: ProfileStore | None, switch: str) -> APIRouter:
+    """GET /profiles and /profiles/{profile_id}: the profiles in `store`.
+
+    `store` is None when profiling is off; the listing then names `switch`,
+    the setting that turns it on.
+    """
+    router = APIRouter()
+
+    @router.get("/profiles")
+    async def list_profiles():
+        """Profiles of requests sent with `X-Profile: 1` or `?profile=1`, newest first."""
+        if store is None:
+            return JSONResponse({"error": f"Profiling is off (set {switch})"}, status_code=404)
+        return {"profiles": store.list()}
+
+    @router.get("/profiles/{profile_id}")
+    async def download_profile(profile_id: str):
+        """One profile as collapsed stacks, ready for flamegraph.pl or speedscope."""
+        path = store.path(profile_id) if store is not None else None
+        if path is None or not os.path.exists(path):
+            return JSONResponse({"error": "Invalid profile id"}, status_code=404)
+        return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.collapsed")
+
+    return router
@@ -1,24 +1,47 @@
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from appkit.assets import Assets
+from appkit.metrics import Metrics, MetricsMiddleware
+from appkit.profiling import ProfilerMiddleware, ProfileStore
+from appkit.routes import metrics_router, profiles_router
 
 from src.api.routes import router
 
 
+# per worker process; scraped from /metrics
+metrics = Metrics()
+# PACKING_PROFILE_DIR=<dir> lets a request ask to be profiled with
+# `X-Profile: 1` or `?profile=1`; unset, the profiler is not installed
+profiles = ProfileStore(os.environ["PACKING_PROFILE_DIR"]) if os.environ.get("PACKING_PROFILE_DIR") else None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 	app.state.pack_cache = {}
+	app.state.engine_seconds = metrics.histogram(
+		"packing_engine_duration_seconds", "Time spent generating layouts by operation and grid.", ("op", "grid")
+	)
 	yield
 
 
 app = FastAPI(title="Circle Packing", lifespan=lifespan)
-
-# mount static and templates (paths are project-relative)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+app.include_router(metrics_router(metrics))
+app.include_router(profiles_router(profiles, "PACKING_PROFILE_DIR"))
+if profiles is not None:
+	app.add_middleware(ProfilerMiddleware, store=profiles)
+
+# mount static and templates (paths are project-relative); static/ is
+# fingerprinted and pre-compressed into static-build/ on startup, and
+# templates link to it with asset_url('js/circle-packing.js')
+assets = Assets("static", "static-build")
+app.mount("/static", assets.files(), name="static")
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["asset_url"] = assets.url
 
 
 @app.get("/", response_class=HTMLResponse)
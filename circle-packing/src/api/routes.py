@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from ..modules import pack
@@ -8,7 +8,7 @@ router = APIRouter(prefix="/api")
 
 
 @router.post("/generate")
-async def generate(payload: dict):
+async def generate(request: Request, payload: dict):
     """Generate circle centers and bounding box for requested grid.
 
     payload: { num_circles: int, grid: 'square'|'hex' }
@@ -16,7 +16,8 @@ async def generate(payload: dict):
     num = int(payload.get("num_circles", 10))
     grid = payload.get("grid", "square")
 
-    centers, bbox = pack.generate_positions(num, grid=grid)
+    with request.app.state.engine_seconds.time("generate_positions", grid):
+        centers, bbox = pack.generate_positions(num, grid=grid)
 
     # compute bbox area in units assuming radius=1
     minx, maxx, miny, maxy = bbox
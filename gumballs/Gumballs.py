@@ -4,8 +4,14 @@ import uvicorn
 import json
 import time
 from io import BytesIO
+from appkit.metrics import Metrics, MetricsMiddleware
+from appkit.routes import metrics_router
 
+# request latency and counts, served at /metrics
+metrics = Metrics()
 app = FastAPI()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+app.include_router(metrics_router(metrics))
 
 HTML_CONTENT = """
 <!DOCTYPE html>
@@ -1,8 +1,14 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 import uvicorn
+from appkit.metrics import Metrics, MetricsMiddleware
+from appkit.routes import metrics_router
 
+# request latency and counts, served at /metrics
+metrics = Metrics()
 app = FastAPI()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+app.include_router(metrics_router(metrics))
 
 # Global list to store submitted layouts (in memory for this example)
 submitted_layouts = []
@@ -0,0 +1,63 @@
+# builtin
+import argparse
+import datetime
+import json
+import sys
+
+# external
+
+# internal
+from src.modules.game.benchmark import DEFAULT_SIZES, compare, environment, run_benchmarks
+
+
+def _load(path: str) -> dict[str, float]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def _report(regressions: list[tuple[str, float, float]], threshold: float) -> int:
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before:.0f} ns -> {after:.0f} ns (+{(after / before - 1) * 100:.1f}%)")
+    if regressions:
+        print(f"{len(regressions)} primitive(s) slower than the baseline by more than {threshold}%")
+        return 1
+    print(f"no regressions beyond {threshold}%")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the hex engine primitives.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and write the results as JSON")
+    run.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="board sizes")
+    run.add_argument("--repeat", type=int, default=5, help="timing rounds per primitive; the best is kept")
+    run.add_argument("--output", default="benchmark.json", help="results file")
+    run.add_argument("--baseline", default=None, help="results file to compare against once the run finishes")
+    run.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+
+    cmp = sub.add_parser("compare", help="compare two results files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        return _report(compare(_load(args.baseline), _load(args.current), args.threshold), args.threshold)
+
+    results = run_benchmarks(tuple(args.sizes), args.repeat, log=print)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "environment": environment(),
+            "results": results,
+        }, f, indent=2)
+    print(f"wrote {len(results)} results to {args.output}")
+    if args.baseline:
+        return _report(compare(_load(args.baseline), results, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+# builtin
+import argparse
+import os
+import time
+
+# external
+
+# internal
+from src.modules.game.book import build_book, write_book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory-mappable hex opening book.")
+    parser.add_argument("--size", type=int, default=11, help="board size")
+    parser.add_argument("--depth", type=int, default=1, help="plies to cover; blue replies are searched on odd plies")
+    parser.add_argument("--playouts", type=int, default=2000, help="MCTS playouts per book position")
+    parser.add_argument("--workers", type=int, default=None, help="search processes (default: all cores)")
+    parser.add_argument("--output", default=None, help="book path (default: book/hex<size>.book)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join("book", f"hex{args.size}.book")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+    start = time.perf_counter()
+    entries = build_book(args.size, args.depth, args.playouts, args.workers)
+    write_book(output, args.size, entries)
+    print(f"wrote {len(entries)} positions to {output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
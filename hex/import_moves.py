@@ -0,0 +1,59 @@
+# builtin
+import argparse
+import json
+import time
+
+# external
+
+# internal
+from src.modules import create_game_store
+from src.modules.game.move_files import FORMATS, import_move_files
+
+
+BATCH_SIZE = 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify hex move files and register them as games.")
+    parser.add_argument("paths", nargs="+", help="move files, or directories searched for *.txt")
+    parser.add_argument("--size", type=int, default=11, help="board size the games were played on")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="file format (default: guessed from each file name)")
+    parser.add_argument("--workers", type=int, default=None, help="verifying processes (default: all cores, 0: in-process)")
+    parser.add_argument("--store", choices=["sqlite", "files", "shared"], default="sqlite", help="game store the server reads (HEX_STORE)")
+    parser.add_argument("--store-path", default=None, help="game store location (HEX_STORE_PATH)")
+    parser.add_argument("--verbose", action="store_true", help="print one JSON line per file")
+    args = parser.parse_args()
+
+    # imported games are written straight to the cold tier (or, for
+    # "shared", the database every worker reads) in batches, so memory stays
+    # flat however many files there are
+    games = create_game_store(args.store, args.store_path)
+    start = time.perf_counter()
+    imported = rejected = moves = 0
+    batch = []
+    try:
+        for result in import_move_files(args.paths, args.size, args.format, args.workers):
+            if result.record is None:
+                rejected += 1
+                line = {"file": result.source, "error": result.error}
+            else:
+                game_id = games.allocate_id()
+                batch.append({**result.record, "gameId": game_id})
+                if len(batch) >= BATCH_SIZE:
+                    games.add_records(batch)
+                    batch = []
+                imported += 1
+                moves += result.moves
+                line = {"file": result.source, "gameId": game_id, "winner": result.winner}
+            if args.verbose:
+                print(json.dumps(line))
+        games.add_records(batch)
+    finally:
+        games.close()
+
+    seconds = time.perf_counter() - start
+    print(f"imported {imported} games ({moves} moves), rejected {rejected}, in {seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,114 @@
 # builtin
+import asyncio
+import os
 from contextlib import asynccontextmanager
 
 # external
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from appkit.assets import Assets
+from appkit.metrics import Metrics, MetricsMiddleware
+from appkit.profiling import ProfilerMiddleware, ProfileStore
+from appkit.routes import metrics_router, profiles_router
 
 # internal
-from src.api import create_game_router, submit_move_router, download_moves_router, undo_router
+from src.api import (
+    create_game_router,
+    submit_move_router,
+    download_moves_router,
+    undo_router,
+    game_socket_router,
+    replay_moves_router,
+    rewind_router,
+    redo_router,
+    import_moves_router,
+    game_position_router,
+    game_queues_router,
+)
+from src.modules import (
+    GameQueues,
+    OpeningBook,
+    TranspositionTable,
+    create_ai_executor,
+    create_game_store,
+    sweep_idle_games,
+)
+
+# per worker process; scraped from /metrics
+metrics = Metrics()
+# HEX_PROFILE_DIR=<dir> lets a request ask to be profiled with `X-Profile: 1`
+# or `?profile=1`; its collapsed stacks are then listed at /profiles. Unset,
+# the profiler is not installed at all.
+profiles = ProfileStore(os.environ["HEX_PROFILE_DIR"]) if os.environ.get("HEX_PROFILE_DIR") else None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.games = {}
+    # HEX_STORE=memory|sqlite|files keeps every game resident (memory) or
+    # parks games idle for HEX_IDLE_TTL seconds at HEX_STORE_PATH, with at
+    # most HEX_HOT_GAMES live in memory. HEX_STORE=shared keeps games in one
+    # SQLite database (WAL) that every worker reads and writes, for
+    # `uvicorn main:app --workers N`; each worker keeps the games it serves
+    # live, so a WebSocket or keep-alive connection stays on the fast path
+    app.state.games = create_game_store(
+        os.environ.get("HEX_STORE", "memory"),
+        os.environ.get("HEX_STORE_PATH"),
+        hot_capacity=int(os.environ.get("HEX_HOT_GAMES", "10000")),
+        idle_ttl=float(os.environ.get("HEX_IDLE_TTL", "300")),
+    )
+    sweeper = asyncio.create_task(sweep_idle_games(app.state.games, interval=30.0))
+    # commands for one game run in order, across workers too when the store
+    # is shared; different games never wait on each other
+    app.state.game_queues = GameQueues(app.state.games)
+    app.state.engine_seconds = metrics.histogram(
+        "hex_engine_duration_seconds", "Time spent in the game engine by operation and AI.", ("op", "ai")
+    )
+    metrics.gauge("hex_games_resident", "Games held live in this worker.", function=lambda: len(app.state.games))
+    metrics.gauge(
+        "hex_game_queues_active", "Games with commands running or waiting.",
+        function=lambda: app.state.game_queues.stats(top=0)["activeGames"],
+    )
+    metrics.gauge(
+        "hex_game_queue_pending", "Commands running or waiting, over all games.",
+        function=lambda: app.state.game_queues.stats(top=0)["pending"],
+    )
+    # HEX_OPENING_BOOK=<path>[,<path>...], files written by build_book.py;
+    # memory-mapped, so only the pages that lookups touch are read
+    app.state.opening_book = OpeningBook(
+        [path for path in os.environ.get("HEX_OPENING_BOOK", "").split(",") if path]
+    )
+    # searched AI replies shared by every game, keyed by canonical position
+    app.state.transposition_table = TranspositionTable(int(os.environ.get("HEX_TT_SIZE", "100000")))
+    # HEX_AI_EXECUTOR=thread|process, HEX_AI_WORKERS=<n> (default: per executor)
+    app.state.ai_executor = create_ai_executor(
+        os.environ.get("HEX_AI_EXECUTOR", "thread"),
+        int(os.environ["HEX_AI_WORKERS"]) if os.environ.get("HEX_AI_WORKERS") else None,
+    )
+    # /import-moves replays on a pool of its own (HEX_IMPORT_EXECUTOR,
+    # HEX_IMPORT_WORKERS, default one thread) so bulk uploads never wait in
+    # line with, or hold up, the AI searches of games being played
+    app.state.import_workers = int(os.environ.get("HEX_IMPORT_WORKERS", "1"))
+    app.state.import_executor = create_ai_executor(
+        os.environ.get("HEX_IMPORT_EXECUTOR", "thread"), app.state.import_workers
+    )
     yield
+    sweeper.cancel()
+    app.state.ai_executor.shutdown(wait=False, cancel_futures=True)
+    app.state.import_executor.shutdown(wait=False, cancel_futures=True)
+    app.state.games.close()
+    app.state.opening_book.close()
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+if profiles is not None:
+    app.add_middleware(ProfilerMiddleware, store=profiles)
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# static/ is fingerprinted and pre-compressed into static-build/ on startup;
+# templates link to it with asset_url('js/hex.js')
+assets = Assets("static", "static-build")
+app.mount("/static", assets.files(), name="static")
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["asset_url"] = assets.url
 
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
@@ -28,4 +118,13 @@ app.include_router(router=create_game_router)
 app.include_router(router=submit_move_router)
 app.include_router(router=download_moves_router)
 # Generated from PS1-Q2
-app.include_router(router=undo_router)
\ No newline at end of file
+app.include_router(router=undo_router)
+app.include_router(router=game_socket_router)
+app.include_router(router=replay_moves_router)
+app.include_router(router=rewind_router)
+app.include_router(router=redo_router)
+app.include_router(router=import_moves_router)
+app.include_router(router=game_position_router)
+app.include_router(router=game_queues_router)
+app.include_router(router=metrics_router(metrics))
+app.include_router(router=profiles_router(profiles, "HEX_PROFILE_DIR"))
\ No newline at end of file
@@ -0,0 +1,36 @@
+# builtin
+import argparse
+import json
+
+# external
+
+# internal
+from src.modules.game.self_play import self_play
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless hex games and report engine throughput.")
+    parser.add_argument("--games", type=int, default=1000, help="complete games to play")
+    parser.add_argument("--size", type=int, default=11, help="board size")
+    parser.add_argument("--ai", choices=["random", "mcts"], default="random", help="blue's AI; red always plays the random heuristic")
+    parser.add_argument("--playouts", type=int, default=None, help="MCTS playouts per AI move")
+    parser.add_argument("--workers", type=int, default=0, help="processes to spread games over (default: play in-process)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random players")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = self_play(args.games, args.size, args.ai, args.playouts, args.workers, args.seed)
+    if args.json:
+        print(json.dumps({
+            **report._asdict(),
+            "gamesPerSec": report.games_per_sec,
+            "movesPerSec": report.moves_per_sec,
+        }))
+        return
+    print(f"{report.games} games, {report.moves} moves in {report.seconds:.2f}s")
+    print(f"{report.games_per_sec:.1f} games/s, {report.moves_per_sec:.0f} moves/s")
+    print(f"process_move p50 {report.p50 * 1e6:.1f}us, p99 {report.p99 * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
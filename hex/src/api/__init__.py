@@ -2,4 +2,11 @@ from .create_game.routes import create_game_router
 from .submit_move.routes import submit_move_router
 from .download_moves.routes import download_moves_router
 # Generated from PS1-Q2
-from .undo_move.routes import undo_router
\ No newline at end of file
+from .undo_move.routes import undo_router
+from .game_socket.routes import game_socket_router
+from .replay_moves.routes import replay_moves_router
+from .rewind_move.routes import rewind_router
+from .redo_move.routes import redo_router
+from .import_moves.routes import import_moves_router
+from .game_position.routes import game_position_router
+from .game_queues.routes import game_queues_router
\ No newline at end of file
@@ -0,0 +1,41 @@
+# builtin
+import asyncio
+
+# external
+from fastapi import FastAPI
+
+# internal
+from src.modules import HexGame, compute_ai_move
+
+
+async def play_ai_reply(app: FastAPI, game: HexGame):
+    """Answer the human move just applied to `game`, without blocking the event loop."""
+    table = app.state.transposition_table
+    # includes book / table hits and, for searches, waiting for a worker
+    with app.state.engine_seconds.time("ai_move", game.ai):
+        move = game.lookup_ai_move(app.state.opening_book) or game.lookup_ai_move(table)
+        if move is None:
+            ai_input = game.ai_request()
+            if game.ai == "random":
+                # cheaper to run inline than to hand off to a worker
+                move, _ = compute_ai_move(ai_input)
+            else:
+                loop = asyncio.get_running_loop()
+                move, playouts = await loop.run_in_executor(app.state.ai_executor, compute_ai_move, ai_input)
+                game.record_ai_move(table, move, playouts)
+    game.apply_ai_move(move)
+
+
+async def resume_ai_turn(app: FastAPI, game: HexGame):
+    """After a rewind or redo that stops on the AI's turn, let it move.
+
+    Replays the AI's own taken-back move when there is one, so the rest of
+    the redo history stays available; otherwise searches a fresh reply.
+    """
+    # status may just be "invalid" from a rejected command; only a win ends the game
+    if game.player != "blue" or game.winner:
+        return
+    if game.redo_moves:
+        game.redo(1)
+    else:
+        await play_ai_reply(app, game)
@@ -0,0 +1,15 @@
+# builtin
+from typing import Literal
+
+# external
+from pydantic import BaseModel, Field
+
+# internal
+
+
+class CreateGameInput(BaseModel):
+    size: int = 11
+    ai: Literal["random", "mcts"] = "random"
+    # MCTS budget per AI move; whichever runs out first ends the search
+    playouts: int | None = Field(default=None, ge=1, le=200_000)
+    thinkMs: int | None = Field(default=None, ge=1, le=10_000)
@@ -1,22 +1,29 @@
 # builtin
-import random
 
 # external
 from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
 # internal
-from src.modules import HexGame
+from ..new_game import new_game
+from ..state_response import state_response
+from .io import CreateGameInput
 
 
 create_game_router = APIRouter()
 
 @create_game_router.post("/create-game")
-async def create_game(request: Request):
-    game_id = f"g{random.randint(1000,9999)}"
-    game = HexGame(game_id=game_id)
-    
-    app = request.app
-    games = app.state.games
-    games[game_id] = game
-    
-    return game.to_json()
\ No newline at end of file
+async def create_game(request: Request, input: CreateGameInput | None = None):
+    input = input or CreateGameInput()
+    games = request.app.state.games
+    game_id = games.allocate_id()
+    game = new_game(game_id, input)
+    if isinstance(game, JSONResponse):
+        return game
+
+    # held like any other command, so a shared store writes the new game
+    # from a thread rather than on the event loop
+    async with request.app.state.game_queues.turn(game_id):
+        games[game_id] = game
+
+    return state_response(request, game)
\ No newline at end of file
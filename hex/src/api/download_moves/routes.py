@@ -6,7 +6,7 @@ from fastapi import APIRouter, Request, Response
 from fastapi.responses import JSONResponse
 
 # internal
-from src.modules import HexGame
+from src.modules import HexGame, lookup_game
 
 
 download_moves_router = APIRouter()
@@ -14,7 +14,7 @@ download_moves_router = APIRouter()
 @download_moves_router.get("/download-moves")
 async def download_moves(gameId: str, request: Request):
     games = request.app.state.games
-    state: HexGame = games.get(gameId)
+    state: HexGame = await lookup_game(games, gameId)
     
     if not state:
         return JSONResponse({"error": "Invalid gameId"}, status_code=400)
@@ -0,0 +1,40 @@
+# builtin
+
+# external
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+# internal
+from src.modules import HexGame, lookup_game
+
+
+game_position_router = APIRouter()
+
+@game_position_router.get("/game-position")
+async def game_position(gameId: str, ply: int, request: Request):
+    """The board after `ply` moves, for scrubbing through a game."""
+    games = request.app.state.games
+    game: HexGame = await lookup_game(games, gameId)
+
+    if not game:
+        return JSONResponse({"error": "Invalid gameId"}, status_code=400)
+
+    try:
+        board = game.position_at(ply)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    moves = game.get_moves()
+    last = moves[ply - 1] if ply else None
+    final = ply == len(moves)
+    return {
+        "gameId": game.game_id,
+        "ply": ply,
+        "plies": len(moves),
+        "board": board.to_rows(),
+        "lastMove": last["move"] if last else "",
+        "player": "blue" if last and last["player"] == "R" else "red",
+        # only the last move can have ended the game
+        "status": game.status if final else "ok",
+        "winner": game.winner if final else "",
+    }
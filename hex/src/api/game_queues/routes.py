@@ -0,0 +1,14 @@
+# builtin
+
+# external
+from fastapi import APIRouter, Request
+
+# internal
+
+
+game_queues_router = APIRouter()
+
+@game_queues_router.get("/game-queues")
+async def game_queues(request: Request):
+    """Commands running or waiting per game, with the deepest queues listed."""
+    return request.app.state.game_queues.stats()
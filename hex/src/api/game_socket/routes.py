@@ -0,0 +1,111 @@
+# builtin
+import json
+
+# external
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+# internal
+from src.modules import HexGame, lookup_game
+from src.modules.game.types import GameMove
+from src.modules.game.wire import encode_state
+from ..ai_reply import play_ai_reply, resume_ai_turn
+
+game_socket_router = APIRouter()
+
+
+@game_socket_router.websocket("/ws/{game_id}")
+async def game_socket(websocket: WebSocket, game_id: str):
+    """One connection per game; frames are {"type": "move" | "undo" | "redo" | "rewind" | "resign", ...}.
+
+    Every accepted frame is answered with a {"type": "state", ...} frame; a
+    move that hands the turn to the AI gets a second state frame as soon as
+    the reply is played. The first state frame is a full snapshot, later
+    ones are deltas against the previous frame sent on this connection.
+    With ?format=binary state frames are sent as binary messages in the
+    application/x-hex-state layout instead; errors stay JSON text.
+    """
+    games = websocket.app.state.games
+    await websocket.accept()
+
+    game = await lookup_game(games, game_id)
+    if not game:
+        await websocket.send_json({"type": "error", "error": "Invalid gameId"})
+        await websocket.close(code=4404)
+        return
+
+    binary = websocket.query_params.get("format") == "binary"
+    sent: int | None = None
+
+    async def send_state(game: HexGame):
+        nonlocal sent
+        if binary:
+            await websocket.send_bytes(encode_state(game, sent))
+        else:
+            await websocket.send_json({"type": "state", **game.to_json_since(sent)})
+        sent = game.version
+
+    await send_state(game)
+
+    try:
+        while True:
+            try:
+                frame = json.loads(await websocket.receive_text())
+            except ValueError:
+                frame = None
+            if not isinstance(frame, dict):
+                await websocket.send_json({"type": "error", "error": "Frames must be JSON objects"})
+                continue
+
+            async with websocket.app.state.game_queues.turn(game_id):
+                # looked up per frame: an idle game may have been parked in the
+                # cold store and reloaded as a new object since the last one
+                game: HexGame = games.get(game_id)
+                if not game:
+                    await websocket.send_json({"type": "error", "error": "Invalid gameId"})
+                    continue
+
+                kind = frame.get("type")
+                if kind == "move":
+                    try:
+                        move = GameMove(move=frame.get("move", ""), player=frame.get("player", game.player))
+                    except ValidationError:
+                        await websocket.send_json({"type": "error", "error": "Invalid move"})
+                        continue
+                    with websocket.app.state.engine_seconds.time("apply_move", game.ai):
+                        ai_turn = game.apply_move(move)
+                    await send_state(game)
+                    if ai_turn:
+                        await play_ai_reply(websocket.app, game)
+                        await send_state(game)
+                elif kind == "undo":
+                    if not game.undo():
+                        await websocket.send_json({"type": "error", "error": "Cannot undo"})
+                        continue
+                    await send_state(game)
+                elif kind == "redo":
+                    plies = frame.get("plies", 2)
+                    plies = min(plies, len(game.redo_moves)) if isinstance(plies, int) else 0
+                    if plies < 1 or not game.redo(plies):
+                        await websocket.send_json({"type": "error", "error": "Cannot redo"})
+                        continue
+                    await resume_ai_turn(websocket.app, game)
+                    await send_state(game)
+                elif kind == "rewind":
+                    ply = frame.get("ply")
+                    if not isinstance(ply, int) or not game.rewind(ply):
+                        await websocket.send_json({"type": "error", "error": "Cannot rewind"})
+                        continue
+                    await resume_ai_turn(websocket.app, game)
+                    await send_state(game)
+                elif kind == "resign":
+                    # the AI plays blue and never concedes; a client may only
+                    # resign the human side
+                    if frame.get("player", "red") != "red" or not game.resign("red"):
+                        await websocket.send_json({"type": "error", "error": "Cannot resign"})
+                        continue
+                    await send_state(game)
+                else:
+                    await websocket.send_json({"type": "error", "error": "Unknown frame type"})
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,62 @@
+# builtin
+import asyncio
+
+# external
+from fastapi import APIRouter, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse
+
+# internal
+from src.modules.game.move_files import FORMATS, verify_moves
+
+import_moves_router = APIRouter()
+
+@import_moves_router.post("/import-moves")
+async def import_moves(
+    request: Request,
+    files: list[UploadFile] = File(...),
+    size: int = Form(11),
+    format: str | None = Form(None),
+):
+    """Verify uploaded move files and register each legal one as a game.
+
+    `format` is "hex" (/download-moves) or "antigravity" (antigravity-hex
+    /save); by default it is guessed from each file name.
+    """
+    if format is not None and format not in FORMATS:
+        return JSONResponse({"error": f"format must be one of {', '.join(FORMATS)}"}, status_code=400)
+
+    games = request.app.state.games
+    loop = asyncio.get_running_loop()
+    # replays run on their own workers, so a large upload neither stalls the
+    # event loop nor queues ahead of live games' AI searches; like the CLI, at
+    # most two files per worker are read and in flight at once
+    executor = request.app.state.import_executor
+    window = asyncio.Semaphore(2 * request.app.state.import_workers)
+    results = [None] * len(files)
+
+    async def verify(i: int, upload: UploadFile):
+        async with window:
+            text = (await upload.read()).decode("utf-8", errors="replace")
+            await upload.close()
+            results[i] = await loop.run_in_executor(
+                executor, verify_moves, upload.filename or "upload.txt", text, format, size,
+            )
+
+    await asyncio.gather(*(verify(i, upload) for i, upload in enumerate(files)))
+
+    records = []
+    imported = []
+    rejected = []
+    for result in results:
+        if result.record is None:
+            rejected.append({"file": result.source, "error": result.error, "firstIllegal": result.first_illegal})
+            continue
+        game_id = games.allocate_id()
+        records.append({**result.record, "gameId": game_id})
+        imported.append({"file": result.source, "gameId": game_id, "moves": result.moves, "winner": result.winner})
+    if games.blocking:
+        await asyncio.to_thread(games.add_records, records)
+    else:
+        games.add_records(records)
+
+    return {"imported": imported, "rejected": rejected}
@@ -0,0 +1,22 @@
+# builtin
+
+# external
+from fastapi.responses import JSONResponse
+
+# internal
+from src.modules import HexGame
+from .create_game.io import CreateGameInput
+
+
+def new_game(game_id: str, input: CreateGameInput) -> HexGame | JSONResponse:
+    """A game with `input`'s size, AI and search budget, or a 400 saying which setting HexGame rejected."""
+    try:
+        return HexGame(
+            game_id=game_id,
+            size=input.size,
+            ai=input.ai,
+            playouts=input.playouts,
+            think_time=input.thinkMs / 1000 if input.thinkMs is not None else None,
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
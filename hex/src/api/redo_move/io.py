@@ -0,0 +1,13 @@
+# builtin
+
+# external
+from pydantic import Field
+
+# internal
+from ..since_version import SinceVersion
+
+
+class RedoInput(SinceVersion):
+    gameId: str
+    # a red move and the AI's reply, mirroring /undo-move
+    plies: int = Field(default=2, ge=1)
@@ -0,0 +1,32 @@
+# builtin
+
+# external
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+# internal
+from src.modules import HexGame
+from ..ai_reply import resume_ai_turn
+from ..state_response import state_response
+from .io import RedoInput
+
+redo_router = APIRouter()
+
+@redo_router.post("/redo-move")
+async def redo_move(request: Request, input: RedoInput):
+    games = request.app.state.games
+
+    async with request.app.state.game_queues.turn(input.gameId):
+        game: HexGame = games.get(input.gameId)
+
+        if not game:
+            return JSONResponse({"error": "Invalid gameId"}, status_code=400)
+
+        # near the end of the history, redo whatever is left
+        plies = min(input.plies, len(game.redo_moves))
+        if not plies or not game.redo(plies):
+            return JSONResponse({"error": "Cannot redo"}, status_code=400)
+
+        await resume_ai_turn(request.app, game)
+
+        return state_response(request, game, input.version)
@@ -0,0 +1,16 @@
+# builtin
+
+# external
+from pydantic import Field
+
+# internal
+from src.modules.game.bitboard import MAX_BOARD_SIZE
+from ..create_game.io import CreateGameInput
+from ..since_version import SinceVersion
+
+
+class ReplayInput(CreateGameInput, SinceVersion):
+    # without a gameId a new game is created from the CreateGameInput fields
+    gameId: str | None = None
+    # alternating red, blue, red, ... from whoever is to move
+    moves: list[str] = Field(max_length=MAX_BOARD_SIZE * MAX_BOARD_SIZE)
@@ -0,0 +1,46 @@
+# builtin
+
+# external
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
+
+# internal
+from src.modules import HexGame
+from ..new_game import new_game
+from ..state_response import state_response
+from .io import ReplayInput
+
+
+replay_moves_router = APIRouter()
+
+@replay_moves_router.post("/replay-moves")
+async def replay_moves(request: Request, input: ReplayInput):
+    """Apply a whole move sequence in one call; the AI does not reply.
+
+    Returns the final state with `firstIllegal`, the index of the move the
+    replay stopped at (null when every move was played). Binary responses
+    carry it in the X-First-Illegal header instead.
+    """
+    games = request.app.state.games
+
+    # a new game gets its id first so it is queued like any other
+    game_id = input.gameId if input.gameId is not None else games.allocate_id()
+    async with request.app.state.game_queues.turn(game_id):
+        if input.gameId is None:
+            game = new_game(game_id, input)
+            if isinstance(game, JSONResponse):
+                return game
+            games[game_id] = game
+        else:
+            game: HexGame = games.get(input.gameId)
+            if not game:
+                return JSONResponse({"error": "Invalid gameId"}, status_code=400)
+
+        first_illegal = game.replay(input.moves)
+
+        state = state_response(request, game, input.version)
+        if isinstance(state, Response):
+            if first_illegal is not None:
+                state.headers["X-First-Illegal"] = str(first_illegal)
+            return state
+        return {**state, "firstIllegal": first_illegal}
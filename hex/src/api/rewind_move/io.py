@@ -0,0 +1,13 @@
+# builtin
+
+# external
+from pydantic import Field
+
+# internal
+from ..since_version import SinceVersion
+
+
+class RewindInput(SinceVersion):
+    gameId: str
+    # number of moves to keep; the rest can be redone
+    ply: int = Field(ge=0)
@@ -0,0 +1,30 @@
+# builtin
+
+# external
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+# internal
+from src.modules import HexGame
+from ..ai_reply import resume_ai_turn
+from ..state_response import state_response
+from .io import RewindInput
+
+rewind_router = APIRouter()
+
+@rewind_router.post("/rewind-move")
+async def rewind_move(request: Request, input: RewindInput):
+    games = request.app.state.games
+
+    async with request.app.state.game_queues.turn(input.gameId):
+        game: HexGame = games.get(input.gameId)
+
+        if not game:
+            return JSONResponse({"error": "Invalid gameId"}, status_code=400)
+
+        if not game.rewind(input.ply):
+            return JSONResponse({"error": "Cannot rewind"}, status_code=400)
+
+        await resume_ai_turn(request.app, game)
+
+        return state_response(request, game, input.version)
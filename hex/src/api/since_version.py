@@ -0,0 +1,13 @@
+# builtin
+
+# external
+from pydantic import BaseModel
+
+# internal
+
+
+class SinceVersion(BaseModel):
+    """Mixed into the input of every command that replies with the game state."""
+
+    # last state version the client holds; state_response then sends a delta
+    version: int | None = None
@@ -0,0 +1,20 @@
+# builtin
+
+# external
+from fastapi import Request
+from fastapi.responses import Response
+
+# internal
+from src.modules import HexGame
+from src.modules.game.wire import MEDIA_TYPE, encode_state
+
+
+def wants_binary(request: Request) -> bool:
+    return MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def state_response(request: Request, game: HexGame, version: int | None = None):
+    """The game's state as JSON, or in the binary wire format when the client asks for it."""
+    if wants_binary(request):
+        return Response(encode_state(game, version), media_type=MEDIA_TYPE, headers={"Vary": "Accept"})
+    return game.to_json_since(version)
@@ -1,12 +1,12 @@
 # builtin
 
 # external
-from pydantic import BaseModel
 
 # internal
+from ..since_version import SinceVersion
 
 
-class MoveInput(BaseModel):
+class MoveInput(SinceVersion):
     gameId: str
     move: str
     player: str
\ No newline at end of file
@@ -6,6 +6,8 @@ from fastapi.responses import JSONResponse
 
 # internal
 from src.modules import HexGame
+from ..ai_reply import play_ai_reply
+from ..state_response import state_response
 from .io import MoveInput
 
 submit_move_router = APIRouter()
@@ -14,11 +16,16 @@ submit_move_router = APIRouter()
 async def submit_move(request: Request, input: MoveInput):
     games = request.app.state.games
     
-    game: HexGame = games.get(input.gameId)
-    
-    if not game: 
-        return JSONResponse({"error": "Invalid gameId"}, status_code=400)
-    
-    game.process_move(input)
-    
-    return game.to_json()
\ No newline at end of file
+    async with request.app.state.game_queues.turn(input.gameId):
+        game: HexGame = games.get(input.gameId)
+        
+        if not game: 
+            return JSONResponse({"error": "Invalid gameId"}, status_code=400)
+        
+        # placing the stone includes the win check (union-find)
+        with request.app.state.engine_seconds.time("apply_move", game.ai):
+            ai_turn = game.apply_move(input)
+        if ai_turn:
+            await play_ai_reply(request.app, game)
+        
+        return state_response(request, game, input.version)
\ No newline at end of file
@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 
 # internal
 from src.modules import HexGame
+from ..state_response import state_response
 
 # Generated from PS1-Q2
 undo_router = APIRouter()
@@ -17,15 +18,20 @@ async def undo_move(request: Request):
 	game_id = data.get("gameId")
 	games = request.app.state.games
 
-	game: HexGame = games.get(game_id)
-
-	if not game:
+	if not isinstance(game_id, str):
 		return JSONResponse({"error": "Invalid gameId"}, status_code=400)
 
-	ok = game.undo()
+	async with request.app.state.game_queues.turn(game_id):
+		game: HexGame = games.get(game_id)
+
+		if not game:
+			return JSONResponse({"error": "Invalid gameId"}, status_code=400)
+
+		ok = game.undo()
 
-	if not ok:
-		return JSONResponse({"error": "Cannot undo"}, status_code=400)
+		if not ok:
+			return JSONResponse({"error": "Cannot undo"}, status_code=400)
 
-	return game.to_json()
+		version = data.get("version")
+		return state_response(request, game, version if isinstance(version, int) else None)
 
@@ -1 +1,5 @@
-from .game.hex_game import HexGame
\ No newline at end of file
+from .game.hex_game import HexGame
+from .game.ai import compute_ai_move, create_ai_executor
+from .game.transposition import TranspositionTable
+from .game.book import OpeningBook
+from .store import GameQueues, GameRegistry, GameStore, create_game_store, lookup_game, sweep_idle_games
@@ -0,0 +1,67 @@
+# builtin
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple
+
+# external
+
+# internal
+from .bitboard import Bitboard
+from .mcts import MCTSEngine
+from .geometry import geometry
+from .utils import ai_move
+
+
+# Search trees kept per worker (thread pool: the server process; process
+# pool: each child), so consecutive moves of a game can reuse their tree.
+MAX_CACHED_ENGINES = 256
+
+_engines: OrderedDict[str, MCTSEngine] = OrderedDict()
+_engines_lock = threading.Lock()
+
+
+class AIRequest(NamedTuple):
+    """Everything an AI worker needs to pick a move, cheap to pickle."""
+    game_id: str
+    size: int
+    red: int
+    blue: int
+    player: str
+    ai: str
+    playouts: int | None
+    think_time: float | None
+
+
+def _engine_for(request: AIRequest) -> MCTSEngine:
+    with _engines_lock:
+        engine = _engines.get(request.game_id)
+        if engine is None or engine.size != request.size:
+            engine = MCTSEngine(request.size, playouts=request.playouts, think_time=request.think_time)
+            _engines[request.game_id] = engine
+            if len(_engines) > MAX_CACHED_ENGINES:
+                _engines.popitem(last=False)
+        else:
+            _engines.move_to_end(request.game_id)
+        return engine
+
+
+def compute_ai_move(request: AIRequest) -> tuple[str, int]:
+    """The AI's reply and how many playouts it took (0 for the random AI)."""
+    board = Bitboard(request.size, request.red, request.blue)
+    if request.ai != "mcts":
+        return ai_move(board, "red" if request.player == "blue" else "blue"), 0
+    # A cached engine whose tree no longer matches the position (another
+    # worker played the previous move, or the game was undone) just starts
+    # a fresh search.
+    engine = _engine_for(request)
+    cell = engine.choose_move(board, request.player)
+    return geometry(request.size).labels[cell], engine.last_playouts
+
+
+def create_ai_executor(kind: str = "thread", workers: int | None = None) -> Executor:
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hex-ai")
+    raise ValueError(f"unknown AI executor {kind!r}")
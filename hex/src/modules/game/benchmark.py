@@ -0,0 +1,147 @@
+# builtin
+import platform
+import random
+import time
+from typing import Callable
+
+# external
+
+# internal
+from .bitboard import Bitboard, iter_cells
+from .geometry import geometry
+from .hex_game import HexGame
+from .types import GameMove
+from .utils import ai_move, check_win, coord_to_index, empty_board
+
+
+# Share of cells filled in each benchmarked position. Positions never
+# contain a winning chain, so the near-full one may come out a little
+# emptier on small boards.
+FILLS = {"sparse": 0.1, "mid": 0.5, "full": 0.9}
+DEFAULT_SIZES = (5, 11, 19)
+
+
+def position(size: int, fill: float, seed: int = 0) -> HexGame:
+    """A game with about `fill` of the board played, no winner, red to move."""
+    rng = random.Random(f"{size}-{fill}-{seed}")
+    game = HexGame("bench", size=size)
+    target = int(size * size * fill) // 2 * 2
+    while len(game.moves) < target:
+        board = game.bitboard
+        cells = list(iter_cells(board.empty()))
+        rng.shuffle(cells)
+        for cell in cells:
+            trial = board.copy()
+            trial.place(cell, game.player)
+            if not trial.connects(game.player):
+                game.replay([geometry(size).labels[cell]])
+                break
+        else:
+            break
+    if game.player != "red":
+        # ran out of non-winning cells for blue; drop red's last move so
+        # red is to move, as process_move and undo expect
+        played = [m["move"] for m in game.moves[:-1]]
+        game = HexGame("bench", size=size)
+        game.replay(played)
+    return game
+
+
+def _time_calls(fn: Callable[[], object], repeat: int, budget: float) -> float:
+    """Best seconds per call of `fn` over `repeat` rounds of about `budget` seconds each."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget / 10 or number >= 1 << 20:
+            break
+        number *= 10
+    number = max(1, int(number * budget / max(elapsed, 1e-9)))
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _time_on_copies(game: HexGame, op: Callable[[HexGame], object], repeat: int, batch: int = 200) -> float:
+    """Best seconds per call of a mutating `op`, each call on a fresh copy of `game`."""
+    record = game.to_record()
+    best = float("inf")
+    for _ in range(repeat):
+        copies = [HexGame.from_record(record) for _ in range(batch)]
+        start = time.perf_counter()
+        for copy in copies:
+            op(copy)
+        best = min(best, (time.perf_counter() - start) / batch)
+    return best
+
+
+def run_benchmarks(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    repeat: int = 5,
+    budget: float = 0.05,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, float]:
+    """Nanoseconds per call, keyed "<primitive>/<size>/<fill>" (size only where fill does not apply)."""
+    results: dict[str, float] = {}
+
+    def record(name: str, seconds: float):
+        results[name] = seconds * 1e9
+        if log:
+            log(f"{name:<32} {seconds * 1e9:>12.0f} ns")
+
+    for size in sizes:
+        labels = geometry(size).labels
+
+        def parse_all():
+            for label in labels:
+                coord_to_index(label)
+
+        record(f"coord_to_index/{size}", _time_calls(parse_all, repeat, budget) / len(labels))
+        record(f"empty_board/{size}", _time_calls(lambda: empty_board(size), repeat, budget))
+
+        for fill_name, fill in FILLS.items():
+            game = position(size, fill)
+            board: Bitboard = game.bitboard
+            empties = list(iter_cells(board.empty()))
+            # a red move that does not end the game, so the AI always replies
+            for cell in empties:
+                trial = board.copy()
+                trial.place(cell, "red")
+                if not trial.connects("red"):
+                    break
+            move = GameMove(move=geometry(size).labels[cell], player="red")
+
+            key = f"{size}/{fill_name}"
+            record(f"check_win/{key}", _time_calls(lambda: (check_win(board, "red"), check_win(board, "blue")), repeat, budget) / 2)
+            record(f"ai_move/{key}", _time_calls(lambda: ai_move(board, "red"), repeat, budget))
+            record(f"to_json/{key}", _time_calls(game.to_json, repeat, budget))
+            record(f"process_move/{key}", _time_on_copies(game, lambda g: g.process_move(move), repeat))
+            if len(game.moves) >= 2:
+                record(f"undo/{key}", _time_on_copies(game, HexGame.undo, repeat))
+    return results
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(baseline: dict[str, float], current: dict[str, float], threshold: float) -> list[tuple[str, float, float]]:
+    """Primitives more than `threshold` percent slower than the baseline, as (name, before, after)."""
+    regressions = []
+    for name, before in baseline.items():
+        after = current.get(name)
+        if after is not None and after > before * (1 + threshold / 100):
+            regressions.append((name, before, after))
+    return regressions
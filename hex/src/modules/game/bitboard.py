@@ -0,0 +1,145 @@
+# builtin
+from functools import lru_cache
+from typing import NamedTuple
+
+# external
+
+# internal
+
+
+MAX_BOARD_SIZE = 32
+
+# Neighbor offsets (dr, dc) of a cell on the rhombic hex board.
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, 1), (1, -1))
+
+# Digit -> cell character for the decimal-packed rows built in `to_rows`.
+_CELL_CHARS = str.maketrans({"1": "R", "2": "B"})
+
+
+class BoardMasks(NamedTuple):
+    full: int
+    top: int
+    bottom: int
+    left: int
+    right: int
+    not_left: int
+    not_right: int
+
+
+@lru_cache(maxsize=None)
+def board_masks(n: int) -> BoardMasks:
+    """Edge masks for an n x n board, cell index r * n + c."""
+    full = (1 << (n * n)) - 1
+    top = (1 << n) - 1
+    bottom = top << (n * (n - 1))
+    left = 0
+    for r in range(n):
+        left |= 1 << (r * n)
+    right = left << (n - 1)
+    return BoardMasks(full, top, bottom, left, right, full ^ left, full ^ right)
+
+
+class Bitboard:
+    """Hex position as one int per color, bit r * n + c set for a stone at (r, c)."""
+
+    size: int
+    red: int
+    blue: int
+    masks: BoardMasks
+
+    def __init__(self, size: int = 11, red: int = 0, blue: int = 0):
+        if not 1 <= size <= MAX_BOARD_SIZE:
+            raise ValueError(f"board size must be between 1 and {MAX_BOARD_SIZE}")
+        self.size = size
+        self.red = red
+        self.blue = blue
+        self.masks = board_masks(size)
+
+    def copy(self) -> "Bitboard":
+        return Bitboard(self.size, self.red, self.blue)
+
+    def stones(self, player: str) -> int:
+        return self.red if player == "red" else self.blue
+
+    def empty(self) -> int:
+        return self.masks.full & ~(self.red | self.blue)
+
+    def occupied(self, cell: int) -> bool:
+        return bool((self.red | self.blue) >> cell & 1)
+
+    def place(self, cell: int, player: str):
+        if player == "red":
+            self.red |= 1 << cell
+        else:
+            self.blue |= 1 << cell
+
+    def clear(self, cell: int):
+        bit = ~(1 << cell)
+        self.red &= bit
+        self.blue &= bit
+
+    def spread(self, bits: int) -> int:
+        """`bits` plus every cell adjacent to one of them."""
+        n = self.size
+        masks = self.masks
+        return (
+            bits
+            | bits << n
+            | bits >> n
+            | (bits << 1) & masks.not_left
+            | (bits >> 1) & masks.not_right
+            | (bits >> (n - 1)) & masks.not_left
+            | (bits << (n - 1)) & masks.not_right
+        ) & masks.full
+
+    def connects(self, player: str) -> bool:
+        masks = self.masks
+        if player == "red":
+            return flood(self.size, masks, self.red, masks.top, masks.bottom)
+        return flood(self.size, masks, self.blue, masks.left, masks.right)
+
+    def to_rows(self) -> list[str]:
+        """Render the board as the "0"/"R"/"B" row strings used by the JSON API."""
+        n = self.size
+        # Reading each color's binary digits as a decimal number puts one
+        # digit per cell, so red + 2 * blue spells the board as 0/1/2 digits
+        # (least significant = cell 0) without a Python-level loop per cell.
+        packed = int(format(self.red, "b")) + 2 * int(format(self.blue, "b"))
+        cells = str(packed).zfill(n * n)[::-1].translate(_CELL_CHARS)
+        return [cells[i:i + n] for i in range(0, n * n, n)]
+
+
+def flood(n: int, masks: BoardMasks, stones: int, start: int, goal: int) -> bool:
+    """Whether `stones` link the `start` edge to the `goal` edge.
+
+    Grows the reached set by one ring of neighbors per step with shifts,
+    so the cost is bounded by the length of the longest chain, not the
+    number of cells.
+    """
+    not_left = masks.not_left
+    not_right = masks.not_right
+    reached = stones & start
+    while reached:
+        if reached & goal:
+            return True
+        grown = (
+            reached
+            | reached << n
+            | reached >> n
+            | (reached << 1) & not_left
+            | (reached >> 1) & not_right
+            | (reached >> (n - 1)) & not_left
+            | (reached << (n - 1)) & not_right
+        ) & stones
+        if grown == reached:
+            return False
+        reached = grown
+    return False
+
+
+def iter_cells(bits: int):
+    """Yield the index of every set bit, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -0,0 +1,155 @@
+# builtin
+import logging
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+# external
+
+# internal
+from .bitboard import Bitboard, iter_cells
+from .mcts import MCTSEngine
+from .transposition import TTEntry
+from .zobrist import ZobristHash
+
+
+# File layout: a header, then a power-of-two open-addressing table of
+# fixed-size slots indexed by the low bits of the canonical Zobrist key.
+# A slot with playouts == 0 is empty.
+MAGIC = b"HEXBOOK1"
+HEADER = struct.Struct("<8sIHH")  # magic, slot count, board size, reserved
+SLOT = struct.Struct("<QIH")  # key, playouts, canonical move cell
+
+log = logging.getLogger(__name__)
+
+
+class BookFile:
+    """One memory-mapped book; pages are only read in when a lookup touches them."""
+
+    path: str
+    size: int
+    slots: int
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a hex opening book")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.slots, self.size, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or not self.slots or self.slots & (self.slots - 1):
+            self._map.close()
+            raise ValueError(f"{path} is not a hex opening book")
+        # a truncated table would fail mid-game, on the first lookup past its end
+        expected, found = HEADER.size + self.slots * SLOT.size, len(self._map)
+        if found != expected:
+            self._map.close()
+            raise ValueError(f"{path} is truncated or corrupt: {self.slots} slots need {expected} bytes, found {found}")
+
+    def get(self, key: int) -> TTEntry | None:
+        mask = self.slots - 1
+        slot = key & mask
+        while True:
+            stored, playouts, move = SLOT.unpack_from(self._map, HEADER.size + slot * SLOT.size)
+            if playouts == 0:
+                return None
+            if stored == key:
+                return TTEntry(move, playouts)
+            slot = (slot + 1) & mask
+
+    def close(self):
+        self._map.close()
+
+
+class OpeningBook:
+    """Read-only opening books, at most one per board size.
+
+    Has the same `get(size, key)` shape as TranspositionTable so HexGame can
+    consult either. A file that cannot be read as a book is logged and
+    skipped; games on that size then search from the first move.
+    """
+
+    def __init__(self, paths: list[str] | None = None):
+        self._books: dict[int, BookFile] = {}
+        for path in paths or []:
+            try:
+                book = BookFile(path)
+            except ValueError as e:
+                log.warning("ignoring opening book: %s", e)
+                continue
+            self._books[book.size] = book
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def get(self, size: int, key: int) -> TTEntry | None:
+        book = self._books.get(size)
+        if book is None:
+            return None
+        return book.get(key)
+
+    def close(self):
+        for book in self._books.values():
+            book.close()
+        self._books.clear()
+
+
+def write_book(path: str, size: int, entries: dict[int, TTEntry]):
+    slots = 1
+    while slots < 2 * len(entries) or slots < 2:
+        slots <<= 1
+    table = bytearray(HEADER.size + slots * SLOT.size)
+    HEADER.pack_into(table, 0, MAGIC, slots, size, 0)
+    mask = slots - 1
+    for key, entry in entries.items():
+        slot = key & mask
+        while SLOT.unpack_from(table, HEADER.size + slot * SLOT.size)[1]:
+            slot = (slot + 1) & mask
+        SLOT.pack_into(table, HEADER.size + slot * SLOT.size, key, entry.playouts, entry.move)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(table)
+    os.replace(tmp, path)
+
+
+def _search(job: tuple[int, int, int, int]) -> tuple[int, int]:
+    size, red, blue, playouts = job
+    engine = MCTSEngine(size, playouts=playouts)
+    return engine.choose_move(Bitboard(size, red, blue), "blue"), engine.last_playouts
+
+
+def build_book(size: int, depth: int, playouts: int, workers: int | None = None) -> dict[int, TTEntry]:
+    """Search every blue-to-move position reachable within `depth` plies.
+
+    Red may play anything; blue always answers with the searched reply, so
+    the positions covered are exactly the ones the AI can reach in a game
+    that starts from the book.
+    """
+    entries: dict[int, TTEntry] = {}
+    # red-to-move positions of the current ply, deduplicated by canonical key
+    frontier = {0: (0, 0)}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for ply in range(1, depth + 1, 2):
+            replies: dict[int, tuple[int, int, bool]] = {}
+            for red, blue in frontier.values():
+                for cell in iter_cells(Bitboard(size, red, blue).empty()):
+                    moved = red | 1 << cell
+                    if Bitboard(size, moved, blue).connects("red"):
+                        continue
+                    h = ZobristHash.of(size, moved, blue)
+                    key, rotated = h.canonical()
+                    if key not in entries and key not in replies:
+                        replies[key] = (moved, blue, rotated)
+
+            jobs = [(size, red, blue, playouts) for red, blue, _ in replies.values()]
+            frontier = {}
+            for (key, (red, blue, rotated)), (move, done) in zip(replies.items(), pool.map(_search, jobs, chunksize=4)):
+                entries[key] = TTEntry(size * size - 1 - move if rotated else move, done)
+                if ply + 1 < depth:
+                    blue_after = blue | 1 << move
+                    board = Bitboard(size, red, blue_after)
+                    if not board.connects("blue"):
+                        frontier[ZobristHash.of(size, red, blue_after).canonical()[0]] = (red, blue_after)
+    return entries
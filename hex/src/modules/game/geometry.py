@@ -0,0 +1,57 @@
+# builtin
+from functools import lru_cache
+from typing import NamedTuple
+
+# external
+
+# internal
+from .bitboard import DIRECTIONS, MAX_BOARD_SIZE
+
+
+# Size-independent label tables for every cell a board can have; the
+# per-size tables below index into these. Columns run A..Z, then AA, AB, ...
+COLUMN_LABELS = [chr(65 + col) for col in range(26)]
+COLUMN_LABELS += [COLUMN_LABELS[col // 26 - 1] + COLUMN_LABELS[col % 26] for col in range(26, MAX_BOARD_SIZE)]
+LABELS = [[COLUMN_LABELS[col] + str(row + 1) for col in range(MAX_BOARD_SIZE)] for row in range(MAX_BOARD_SIZE)]
+COORDS = {LABELS[row][col]: (row, col) for row in range(MAX_BOARD_SIZE) for col in range(MAX_BOARD_SIZE)}
+
+
+class Geometry(NamedTuple):
+    """Lookup tables for an n x n board, cells indexed r * n + c."""
+    size: int
+    # neighbors[cell]: indices of the (up to six) adjacent cells
+    neighbors: list[tuple[int, ...]]
+    top: frozenset[int]
+    bottom: frozenset[int]
+    left: frozenset[int]
+    right: frozenset[int]
+    # labels[cell] -> "A1" style coordinate, and back
+    labels: list[str]
+    cells: dict[str, int]
+
+
+@lru_cache(maxsize=None)
+def geometry(n: int) -> Geometry:
+    if not 1 <= n <= MAX_BOARD_SIZE:
+        raise ValueError(f"board size must be between 1 and {MAX_BOARD_SIZE}")
+    neighbors = []
+    labels = []
+    for r in range(n):
+        for c in range(n):
+            neighbors.append(tuple(
+                (r + dr) * n + c + dc
+                for dr, dc in DIRECTIONS
+                if 0 <= r + dr < n and 0 <= c + dc < n
+            ))
+            labels.append(LABELS[r][c])
+
+    return Geometry(
+        n,
+        neighbors,
+        frozenset(range(n)),
+        frozenset(range(n * (n - 1), n * n)),
+        frozenset(range(0, n * n, n)),
+        frozenset(range(n - 1, n * n, n)),
+        labels,
+        {label: cell for cell, label in enumerate(labels)},
+    )
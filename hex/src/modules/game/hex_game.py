@@ -3,108 +3,411 @@
 # external
 
 # internal
-from .utils import ai_move, check_win, coord_to_index, empty_board 
+from .bitboard import Bitboard
+from .ai import AIRequest, compute_ai_move
+from .book import OpeningBook
+from .transposition import TranspositionTable, TTEntry
+from .geometry import Geometry, geometry
+from .utils import empty_board
 from .types import GameMove
+from .union_find import UnionFind
+from .zobrist import ZobristHash
+
+
+# Change-log entries kept for delta responses; older clients get snapshots.
+MAX_CHANGES = 256
+# Moves between stored positions used to seek within a game.
+CHECKPOINT_INTERVAL = 16
 
 
 class HexGame: 
     game_id: str
-    board: list[str]
+    size: int
+    geometry: Geometry
+    bitboard: Bitboard
     player: str
     last_move: str
     move_number: int
     status: str
     winner: str
     moves: list[dict]
+    red_top: int
+    red_bottom: int
+    blue_left: int
+    blue_right: int
+    red_sets: UnionFind
+    blue_sets: UnionFind
+    marks: list[int]
+    zobrist: ZobristHash
+    ai: str
+    playouts: int | None
+    think_time: float | None
+    version: int
+    changes: list[tuple[int, dict | None, str]]
+    changes_from: int
+    redo_moves: list[dict]
+    checkpoints: list[tuple[int, int]]
 
-    def __init__(self, game_id: str):
+    def __init__(
+        self,
+        game_id: str,
+        size: int = 11,
+        ai: str = "random",
+        playouts: int | None = None,
+        think_time: float | None = None,
+    ):
         self.game_id = game_id
-        self.board = empty_board()
+        self.size = size
+        self.geometry = geometry(size)
+        self.bitboard = empty_board(size)
         self.player = "red"
         self.last_move = ""
         self.move_number = 0
         self.status = "ok"
         self.winner = ""
         self.moves = []
-        
+
+        # Win detection: one disjoint-set forest per color over the n*n cells
+        # plus two virtual nodes for the edges that color has to connect.
+        n = size
+        self.red_top, self.red_bottom = n * n, n * n + 1
+        self.blue_left, self.blue_right = n * n, n * n + 1
+        self.red_sets = UnionFind(n * n + 2)
+        self.blue_sets = UnionFind(n * n + 2)
+        # Union-find mark taken before each entry of `moves`, for rollback.
+        self.marks = []
+        self.zobrist = ZobristHash(size)
+
+        # "random" keeps the cheap adjacent-cell reply; "mcts" searches with
+        # the given per-move budget.
+        if ai == "mcts" and playouts is None and think_time is None:
+            playouts = 1000
+        self.ai = ai
+        self.playouts = playouts
+        self.think_time = think_time
+
+        # Bumped by every public mutator. `changes` logs each push/pop of
+        # `moves` as (version, pushed move or None, cell) so a client at an
+        # older version can be sent just the difference; versions before
+        # `changes_from` have been trimmed and need a full snapshot.
+        self.version = 0
+        self.changes = []
+        self.changes_from = 0
+
+        # Moves taken back by undo/rewind, the most recently taken back
+        # last; playing the same move again keeps the rest for redo.
+        self.redo_moves = []
+
+        # (red, blue) bitboards after every CHECKPOINT_INTERVAL-th move, so
+        # any earlier position is at most that many moves from one of them
+        self.checkpoints = []
+
+    @property
+    def board(self) -> list[str]:
+        return self.bitboard.to_rows()
+
+    def _place(self, cell: int, player: str) -> bool:
+        """Put a stone for `player` on `cell` and return whether it wins."""
+        geo = self.geometry
+        board = self.bitboard
+        sets = self.red_sets if player == "red" else self.blue_sets
+
+        board.place(cell, player)
+        self.zobrist.toggle(cell, player)
+        self.marks.append(sets.mark())
+
+        stones = board.stones(player)
+        for other in geo.neighbors[cell]:
+            if stones >> other & 1:
+                sets.union(cell, other)
+
+        if player == "red":
+            if cell in geo.top:
+                sets.union(cell, self.red_top)
+            if cell in geo.bottom:
+                sets.union(cell, self.red_bottom)
+            return sets.connected(self.red_top, self.red_bottom)
+
+        if cell in geo.left:
+            sets.union(cell, self.blue_left)
+        if cell in geo.right:
+            sets.union(cell, self.blue_right)
+        return sets.connected(self.blue_left, self.blue_right)
+
+    def _unplace(self, cell: int, stone: str):
+        sets = self.red_sets if stone == "R" else self.blue_sets
+        sets.rollback(self.marks.pop())
+        self.bitboard.clear(cell)
+        self.zobrist.toggle(cell, "red" if stone == "R" else "blue")
+
+    def _push_move(self, move: str, stone: str):
+        entry = {"move": move, "player": stone}
+        if self.redo_moves:
+            if self.redo_moves[-1] == entry:
+                self.redo_moves.pop()
+            else:
+                self.redo_moves.clear()
+        self.moves.append(entry)
+        if len(self.moves) % CHECKPOINT_INTERVAL == 0:
+            self.checkpoints.append((self.bitboard.red, self.bitboard.blue))
+        self.changes.append((self.version, entry, move))
+        if len(self.changes) > 2 * MAX_CHANGES:
+            self.changes_from = self.changes[-MAX_CHANGES - 1][0]
+            del self.changes[:-MAX_CHANGES]
+
+    def _pop_move(self) -> dict:
+        entry = self.moves.pop()
+        if len(self.checkpoints) * CHECKPOINT_INTERVAL > len(self.moves):
+            self.checkpoints.pop()
+        self.changes.append((self.version, None, entry["move"]))
+        return entry
+
+    def _step_back(self):
+        """Take back the last move; the union-find rollback undoes its unions."""
+        entry = self._pop_move()
+        self._unplace(self.geometry.cells[entry["move"]], entry["player"])
+        self.move_number = max(0, self.move_number - 1)
+        self.redo_moves.append(entry)
+
+    def _settle(self):
+        # only a game's final move can win it, so an earlier position is open
+        self.last_move = self.moves[-1]["move"] if self.moves else ""
+        self.status = "ok"
+        self.winner = ""
+        self.player = "blue" if self.moves and self.moves[-1]["player"] == "R" else "red"
+
     def process_move(self, input: GameMove):
-        move = input.move
-        player = input.player
-        try:
-            r, c = coord_to_index(move)
-        except Exception:
-            self.status = "invalid"
-            return
+        if self.apply_move(input):
+            move, _ = compute_ai_move(self.ai_request())
+            self.apply_ai_move(move)
 
-        if not (0 <= r < len(self.board) and 0 <= c < len(self.board)):
+    def _play(self, move: str, player: str) -> bool:
+        """Validate and play one move for `player`; False if it is illegal."""
+        cell = self.geometry.cells.get(move)
+        if cell is None:
             self.status = "invalid"
-            return
+            return False
 
-        if self.board[r][c] != "0" or self.player != player or self.status == "win":
+        # status is overwritten by any rejected command; winner is only
+        # cleared by taking moves back
+        if self.bitboard.occupied(cell) or self.player != player or self.winner:
             self.status = "invalid"
-            return
+            return False
 
-        row = list(self.board[r])
-        row[c] = "R" if player == "red" else "B"
-        self.board[r] = "".join(row)
+        won = self._place(cell, player)
         self.last_move = move
         self.move_number += 1
-        self.moves.append({"move": move, "player": "R" if player == "red" else "B"})
+        self._push_move(move, "R" if player == "red" else "B")
 
-        if check_win(self.board, player):
+        if won:
             self.status = "win"
             self.winner = player
+        else:
+            self.player = "blue" if player == "red" else "red"
+        return True
+
+    def apply_move(self, input: GameMove) -> bool:
+        """Play the human move; True when the AI has to reply next."""
+        self.version += 1
+        if not self._play(input.move, input.player):
+            return False
+        return not self.winner and self.player == "blue"
+
+    def replay(self, moves: list[str]) -> int | None:
+        """Play `moves` for alternating sides, with no AI replies.
+
+        Stops at the first illegal move and returns its index; the moves
+        before it stay played.
+        """
+        self.version += 1
+        for i, move in enumerate(moves):
+            if not self._play(move, self.player):
+                return i
+        return None
+
+    def ai_request(self) -> AIRequest:
+        return AIRequest(
+            self.game_id,
+            self.size,
+            self.bitboard.red,
+            self.bitboard.blue,
+            self.player,
+            self.ai,
+            self.playouts,
+            self.think_time,
+        )
+
+    def lookup_ai_move(self, table: TranspositionTable | OpeningBook) -> str | None:
+        """A stored reply for this position searched at least as deeply as this game asks for.
+
+        Budgets are compared like with like: a playout budget against the
+        playouts the entry ran, a think time against the think time it
+        searched for. With both, the search would stop at whichever comes
+        first, so either one being met is enough.
+        """
+        if self.ai != "mcts":
+            return None
+        key, rotated = self.zobrist.canonical()
+        entry = table.get(self.size, key)
+        if entry is None:
+            return None
+        deep_enough = (self.playouts is not None and entry.playouts >= self.playouts) or (
+            self.think_time is not None and entry.think_time is not None and entry.think_time >= self.think_time
+        )
+        if not deep_enough:
+            return None
+        cell = self.zobrist.rotate_cell(entry.move) if rotated else entry.move
+        if self.bitboard.occupied(cell):
+            # a 64-bit key collision; search instead
+            return None
+        return self.geometry.labels[cell]
+
+    def record_ai_move(self, table: TranspositionTable, move: str, playouts: int):
+        """Store the reply searched for the current position (before it is played)."""
+        if self.ai != "mcts":
             return
+        cell = self.geometry.cells[move]
+        key, rotated = self.zobrist.canonical()
+        if rotated:
+            cell = self.zobrist.rotate_cell(cell)
+        # the clock only stopped the search if the playout budget did not
+        timed_out = self.think_time is not None and (self.playouts is None or playouts < self.playouts)
+        table.put(self.size, key, TTEntry(cell, playouts, self.think_time if timed_out else None))
 
-        self.player = "blue" if player == "red" else "red"
-
-        if self.player == "blue":
-            ai = ai_move(self.board, "red")
-            r_ai, c_ai = coord_to_index(ai)
-            row = list(self.board[r_ai])
-            row[c_ai] = "B"
-            self.board[r_ai] = "".join(row)
-            self.last_move = ai
-            self.move_number += 1
-            self.moves.append({"move": ai, "player": "B"})
-            if check_win(self.board, "blue"):
-                self.status = "win"
-                self.winner = "blue"
-            else:
-                self.player = "red"
+    def apply_ai_move(self, ai: str):
+        self.version += 1
+        won = self._place(self.geometry.cells[ai], "blue")
+        self.last_move = ai
+        self.move_number += 1
+        self._push_move(ai, "B")
+        if won:
+            self.status = "win"
+            self.winner = "blue"
+        else:
+            self.player = "red"
+
+    def resign(self, player: str) -> bool:
+        self.version += 1
+        if self.winner or player not in ("red", "blue"):
+            self.status = "invalid"
+            return False
+        self.status = "win"
+        self.winner = "blue" if player == "red" else "red"
+        return True
 
     # Generated from PS1-Q2
     def undo(self) -> bool:
+        """Take back red's last move and everything after it, so red moves again."""
+        self.version += 1
 
-        if self.player != "red":
+        # blue to move in an open game means the AI's reply is still pending;
+        # undoing under it would let the reply land on the rolled-back board
+        if self.player == "blue" and not self.winner:
             self.status = "invalid"
             return False
 
-        if len(self.moves) < 2:
+        # red always opens, so any game with moves has a red move to take back
+        if not self.moves:
             self.status = "invalid"
             return False
 
-        for _ in range(2):
-            last = self.moves.pop()
-            mv = last["move"]
-            try:
-                r, c = coord_to_index(mv)
-            except Exception:
-                self.status = "invalid"
-                return False
-            row = list(self.board[r])
-            row[c] = "0"
-            self.board[r] = "".join(row)
-            self.move_number = max(0, self.move_number - 1)
+        while self.moves[-1]["player"] != "R":
+            self._step_back()
+        self._step_back()
+        self._settle()
+        return True
 
-        self.last_move = self.moves[-1]["move"] if self.moves else ""
-        self.status = "ok"
-        self.winner = ""
-        self.player = "red"
+    def rewind(self, ply: int) -> bool:
+        """Go back to the position after `ply` moves; cost is the distance moved."""
+        self.version += 1
+        if not 0 <= ply <= len(self.moves):
+            self.status = "invalid"
+            return False
+        if ply < len(self.moves):
+            while len(self.moves) > ply:
+                self._step_back()
+            self._settle()
+        return True
+
+    def redo(self, plies: int = 1) -> bool:
+        """Replay the next `plies` moves taken back by undo or rewind."""
+        self.version += 1
+        if self.winner or not 1 <= plies <= len(self.redo_moves):
+            self.status = "invalid"
+            return False
+        for _ in range(plies):
+            entry = self.redo_moves[-1]
+            # _play re-unions the stone and rechecks the win; pushing the
+            # entry pops it off redo_moves
+            if not self._play(entry["move"], "red" if entry["player"] == "R" else "blue"):
+                return False
         return True
     
+    def to_record(self) -> dict:
+        """Everything needed to rebuild the game; derived state is replayed."""
+        return {
+            "gameId": self.game_id,
+            "size": self.size,
+            "ai": self.ai,
+            "playouts": self.playouts,
+            "thinkTime": self.think_time,
+            "player": self.player,
+            "lastMove": self.last_move,
+            "moveNumber": self.move_number,
+            "status": self.status,
+            "winner": self.winner,
+            "moves": self.moves,
+            "redoMoves": self.redo_moves,
+            "checkpoints": [[format(red, "x"), format(blue, "x")] for red, blue in self.checkpoints],
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> "HexGame":
+        game = cls(
+            record["gameId"],
+            size=record["size"],
+            ai=record["ai"],
+            playouts=record["playouts"],
+            think_time=record["thinkTime"],
+        )
+        cells = game.geometry.cells
+        stored = record.get("checkpoints")
+        for ply, m in enumerate(record["moves"], 1):
+            game._place(cells[m["move"]], "red" if m["player"] == "R" else "blue")
+            if stored is None and ply % CHECKPOINT_INTERVAL == 0:
+                # records from before checkpoints were kept
+                game.checkpoints.append((game.bitboard.red, game.bitboard.blue))
+        if stored is not None:
+            game.checkpoints = [(int(red, 16), int(blue, 16)) for red, blue in stored]
+        game.moves = list(record["moves"])
+        game.player = record["player"]
+        game.last_move = record["lastMove"]
+        game.move_number = record["moveNumber"]
+        game.status = record["status"]
+        game.winner = record["winner"]
+        game.redo_moves = list(record.get("redoMoves", []))
+        # the change log is not persisted: clients from before the reload
+        # get one full snapshot
+        game.version = game.changes_from = record.get("version", 0)
+        return game
+
     def get_moves(self) -> list[dict]:
         return self.moves
+
+    def position_at(self, ply: int) -> Bitboard:
+        """The board after the first `ply` moves, rebuilt from the nearest checkpoint."""
+        if not 0 <= ply <= len(self.moves):
+            raise ValueError(f"ply must be between 0 and {len(self.moves)}")
+        checkpoint = ply // CHECKPOINT_INTERVAL
+        if checkpoint:
+            board = Bitboard(self.size, *self.checkpoints[checkpoint - 1])
+        else:
+            board = Bitboard(self.size)
+        cells = self.geometry.cells
+        for m in self.moves[checkpoint * CHECKPOINT_INTERVAL:ply]:
+            board.place(cells[m["move"]], "red" if m["player"] == "R" else "blue")
+        return board
     
     def to_json(self) -> dict:
         return {
@@ -115,5 +418,49 @@ class HexGame:
             "moveNumber": self.move_number,
             "status": self.status,
             "moves": self.moves,
-            "winner": self.winner
+            "winner": self.winner,
+            "version": self.version,
+        }
+
+    def to_json_since(self, version: int | None) -> dict:
+        """Only what changed after `version`, or a full snapshot when that is unknown."""
+        if version is None or not self.changes_from <= version <= self.version:
+            return self.to_json()
+
+        removed = 0
+        added: list[dict] = []
+        touched: set[str] = set()
+        # the log is ordered by version, so scan back to the first newer entry
+        start = len(self.changes)
+        while start and self.changes[start - 1][0] > version:
+            start -= 1
+        for _, entry, cell in self.changes[start:]:
+            touched.add(cell)
+            if entry is not None:
+                added.append(entry)
+            elif added:
+                added.pop()
+            else:
+                removed += 1
+
+        red, blue = self.bitboard.red, self.bitboard.blue
+        index = self.geometry.cells
+        cells = {}
+        for cell in touched:
+            i = index[cell]
+            cells[cell] = "R" if red >> i & 1 else "B" if blue >> i & 1 else "0"
+
+        return {
+            "gameId": self.game_id,
+            "delta": True,
+            "since": version,
+            "version": self.version,
+            "player": self.player,
+            "lastMove": self.last_move,
+            "moveNumber": self.move_number,
+            "status": self.status,
+            "winner": self.winner,
+            "movesRemoved": removed,
+            "movesAdded": added,
+            "cells": cells,
         }
\ No newline at end of file
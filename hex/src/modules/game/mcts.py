@@ -0,0 +1,204 @@
+# builtin
+import math
+import random
+import time
+
+# external
+
+# internal
+from .bitboard import Bitboard, board_masks, flood, iter_cells
+
+
+def other(player: str) -> str:
+    return "blue" if player == "red" else "red"
+
+
+class MCTSNode:
+    __slots__ = ("move", "mover", "parent", "children", "untried", "visits", "wins")
+
+    move: int
+    mover: str
+    parent: "MCTSNode | None"
+    children: list["MCTSNode"]
+    untried: list[int] | None
+    visits: int
+    wins: int
+
+    def __init__(self, move: int, mover: str, parent: "MCTSNode | None"):
+        # `mover` played `move` to reach this node; `wins` counts playouts
+        # won by `mover`, which is what its parent maximises when selecting.
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.wins = 0
+
+
+class MCTSEngine:
+    """UCT search with uniformly random playouts on bitboards.
+
+    Strength is set per engine by `playouts` (iterations per move) and/or
+    `think_time` (seconds per move); the search stops at whichever budget
+    runs out first. The tree below the chosen move is kept, so the next
+    call starts from the statistics gathered under the opponent's reply.
+    """
+
+    size: int
+    playouts: int | None
+    think_time: float | None
+    exploration: float
+    root: MCTSNode | None
+    root_red: int
+    root_blue: int
+    last_playouts: int
+
+    def __init__(
+        self,
+        size: int = 11,
+        playouts: int | None = 1000,
+        think_time: float | None = None,
+        exploration: float = 1.0,
+    ):
+        if playouts is None and think_time is None:
+            raise ValueError("MCTS needs a playout or think-time budget")
+        self.size = size
+        self.playouts = playouts
+        self.think_time = think_time
+        self.exploration = exploration
+        self.root = None
+        self.root_red = 0
+        self.root_blue = 0
+        self.last_playouts = 0
+
+        self._masks = board_masks(size)
+        self._bits = [1 << cell for cell in range(size * size)]
+
+    def choose_move(self, board: Bitboard, player: str) -> int:
+        """Search the position for `player` and return the chosen cell index."""
+        root = self._advance(board, player)
+        deadline = time.perf_counter() + self.think_time if self.think_time is not None else None
+        limit = self.playouts if self.playouts is not None else math.inf
+
+        count = 0
+        while count < limit:
+            # the clock is only read every 16 playouts; it costs as much as
+            # the bit twiddling in a playout on small boards
+            if deadline is not None and count & 15 == 0 and count and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, board.red, board.blue)
+            count += 1
+        self.last_playouts = count
+
+        best = max(root.children, key=lambda child: child.visits)
+        red, blue = board.red, board.blue
+        if player == "red":
+            red |= self._bits[best.move]
+        else:
+            blue |= self._bits[best.move]
+        self._set_root(best, red, blue)
+        return best.move
+
+    def _advance(self, board: Bitboard, player: str) -> MCTSNode:
+        """Walk the kept tree down to `board`, or start a fresh one."""
+        node = self.root
+        red, blue = board.red, board.blue
+        # stones that disappeared mean the game was rewound past the root
+        if node is None or self.root_red & ~red or self.root_blue & ~blue:
+            return self._reset(red, blue, player)
+
+        new_red = red & ~self.root_red
+        new_blue = blue & ~self.root_blue
+        while new_red or new_blue:
+            mover = other(node.mover)
+            placed = new_red if mover == "red" else new_blue
+            for child in node.children:
+                if placed >> child.move & 1:
+                    break
+            else:
+                return self._reset(red, blue, player)
+            node = child
+            if mover == "red":
+                new_red ^= self._bits[node.move]
+            else:
+                new_blue ^= self._bits[node.move]
+
+        if node.mover == player:
+            return self._reset(red, blue, player)
+        self._set_root(node, red, blue)
+        return node
+
+    def _reset(self, red: int, blue: int, player: str) -> MCTSNode:
+        self.root = MCTSNode(-1, other(player), None)
+        self.root_red = red
+        self.root_blue = blue
+        return self.root
+
+    def _set_root(self, node: MCTSNode, red: int, blue: int):
+        # detach so the rest of the old tree can be collected
+        node.parent = None
+        self.root = node
+        self.root_red = red
+        self.root_blue = blue
+
+    def _iterate(self, root: MCTSNode, red: int, blue: int):
+        bits = self._bits
+        full = self._masks.full
+        c = self.exploration
+        node = root
+
+        # selection
+        while node.untried is not None and not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            best = None
+            best_score = -1.0
+            for child in node.children:
+                score = child.wins / child.visits + c * math.sqrt(log_visits / child.visits)
+                if score > best_score:
+                    best, best_score = child, score
+            node = best
+            if node.mover == "red":
+                red |= bits[node.move]
+            else:
+                blue |= bits[node.move]
+
+        # expansion
+        if node.untried is None:
+            node.untried = list(iter_cells(full & ~(red | blue)))
+            random.shuffle(node.untried)
+        if node.untried:
+            mover = other(node.mover)
+            child = MCTSNode(node.untried.pop(), mover, node)
+            node.children.append(child)
+            node = child
+            if mover == "red":
+                red |= bits[node.move]
+            else:
+                blue |= bits[node.move]
+
+        winner = self._playout(red, blue, other(node.mover))
+
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            if node.mover == winner:
+                node.wins += 1
+            node = node.parent
+
+    def _playout(self, red: int, blue: int, to_move: str) -> str:
+        # Filling the board at random and checking who connects gives the
+        # same winner distribution as playing the random moves out one at a
+        # time, since a full hex board always has exactly one winner.
+        bits = self._bits
+        masks = self._masks
+        cells = list(iter_cells(masks.full & ~(red | blue)))
+        random.shuffle(cells)
+        first = (len(cells) + 1) // 2
+        if to_move == "red":
+            for cell in cells[:first]:
+                red |= bits[cell]
+        else:
+            for cell in cells[first:]:
+                red |= bits[cell]
+        return "red" if flood(self.size, masks, red, masks.top, masks.bottom) else "blue"
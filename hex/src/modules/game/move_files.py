@@ -0,0 +1,133 @@
+# builtin
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, NamedTuple
+
+# external
+
+# internal
+from .geometry import COORDS, LABELS
+from .hex_game import HexGame
+
+
+# "hex" files come from /download-moves and use this app's labels (column
+# letter, row number). "antigravity" files come from antigravity-hex's
+# /save and put the row first: "C5" is row C, column 5, i.e. "E3" here.
+FORMATS = ("hex", "antigravity")
+
+
+class ImportResult(NamedTuple):
+    source: str
+    # the verified game, ready for HexGame.from_record once given an id;
+    # None when the file was rejected
+    record: dict | None
+    moves: int
+    first_illegal: int | None
+    winner: str
+    error: str | None
+
+
+def detect_format(filename: str) -> str:
+    # antigravity-hex saves HEX<timestamp>.txt; /download-moves saves hex_moves_<id>_<timestamp>.txt
+    return "antigravity" if os.path.basename(filename).startswith("HEX") else "hex"
+
+
+def parse_moves(text: str, fmt: str) -> list[str]:
+    """The comma-separated moves of a file, as this app's labels."""
+    moves = [token.strip() for token in text.split(",")]
+    moves = [token for token in moves if token]
+    if fmt == "antigravity":
+        # unknown tokens are kept as they are and rejected as illegal moves
+        moves = [LABELS[COORDS[m][1]][COORDS[m][0]] if m in COORDS else m for m in moves]
+    return moves
+
+
+def verify_moves(source: str, text: str, fmt: str | None = None, size: int = 11) -> ImportResult:
+    """Replay a move file on a fresh game, checking every move and finding the winner."""
+    fmt = fmt or detect_format(source)
+    if fmt not in FORMATS:
+        return ImportResult(source, None, 0, None, "", f"unknown format {fmt!r}")
+    moves = parse_moves(text, fmt)
+    try:
+        game = HexGame("import", size=size)
+    except ValueError as e:
+        return ImportResult(source, None, len(moves), None, "", str(e))
+
+    first_illegal = game.replay(moves)
+    if first_illegal is not None:
+        error = f"illegal move {moves[first_illegal]!r} at index {first_illegal}"
+        return ImportResult(source, None, len(moves), first_illegal, game.winner, error)
+    return ImportResult(source, game.to_record(), len(moves), None, game.winner, None)
+
+
+def _verify_files(job: tuple[list[str], str | None, int]) -> list[ImportResult]:
+    paths, fmt, size = job
+    results = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            results.append(ImportResult(path, None, 0, None, "", str(e)))
+            continue
+        results.append(verify_moves(path, text, fmt, size))
+    return results
+
+
+def iter_move_files(paths: Iterable[str]) -> Iterator[str]:
+    """Every .txt file under `paths`, walked lazily so huge directories are never listed at once."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        stack = [path]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".txt"):
+                        yield entry.path
+
+
+def _chunks(items: Iterator[str], size: int) -> Iterator[list[str]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_move_files(
+    paths: Iterable[str],
+    size: int = 11,
+    fmt: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 64,
+) -> Iterator[ImportResult]:
+    """Verify every move file under `paths`, yielding results as they finish.
+
+    With `workers` == 0 files are verified in-process; otherwise they are
+    read and replayed by a process pool, with at most two chunks per worker
+    in flight so memory stays bounded however many files there are.
+    """
+    chunks = _chunks(iter_move_files(paths), chunk_size)
+    if workers == 0:
+        for chunk in chunks:
+            yield from _verify_files((chunk, fmt, size))
+        return
+
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_verify_files, (chunk, fmt, size)))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
@@ -0,0 +1,79 @@
+# builtin
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+# external
+
+# internal
+from .hex_game import HexGame
+from .types import GameMove
+from .utils import ai_move
+
+
+class SelfPlayReport(NamedTuple):
+    games: int
+    moves: int
+    seconds: float
+    # seconds per HexGame.process_move call, i.e. one red move plus the AI reply
+    p50: float
+    p99: float
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.seconds
+
+    @property
+    def moves_per_sec(self) -> float:
+        return self.moves / self.seconds
+
+
+def _play(job: tuple[int, int, int, str, int | None, int]) -> tuple[int, list[float]]:
+    """Play games [first, first + count); return the plies played and process_move latencies."""
+    first, count, size, ai, playouts, seed = job
+    random.seed(seed + first)
+    moves = 0
+    latencies = []
+    for i in range(first, first + count):
+        game = HexGame(f"self-play-{i}", size=size, ai=ai, playouts=playouts)
+        while not game.winner:
+            # red plays the same adjacent-cell heuristic as the random AI
+            move = GameMove(move=ai_move(game.bitboard, "blue"), player="red")
+            start = time.perf_counter()
+            game.process_move(move)
+            latencies.append(time.perf_counter() - start)
+        moves += len(game.moves)
+    return moves, latencies
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def self_play(
+    games: int,
+    size: int = 11,
+    ai: str = "random",
+    playouts: int | None = None,
+    workers: int = 0,
+    seed: int = 0,
+) -> SelfPlayReport:
+    """Play `games` complete games, in-process or spread over `workers` processes."""
+    if workers:
+        chunk = max(1, games // (workers * 4))
+        jobs = [(first, min(chunk, games - first), size, ai, playouts, seed) for first in range(0, games, chunk)]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_play, jobs))
+        seconds = time.perf_counter() - start
+    else:
+        start = time.perf_counter()
+        results = [_play((0, games, size, ai, playouts, seed))]
+        seconds = time.perf_counter() - start
+
+    moves = sum(done for done, _ in results)
+    latencies = sorted(t for _, times in results for t in times)
+    return SelfPlayReport(games, moves, seconds, _percentile(latencies, 0.50), _percentile(latencies, 0.99))
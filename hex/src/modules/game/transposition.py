@@ -0,0 +1,62 @@
+# builtin
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+# external
+
+# internal
+
+
+class TTEntry(NamedTuple):
+    # best reply in the canonical orientation of the position
+    move: int
+    playouts: int
+    # seconds the search ran to when a think-time budget stopped it; None
+    # when it stopped at a playout count (and for book entries)
+    think_time: float | None = None
+
+
+class TranspositionTable:
+    """Bounded LRU map from (board size, canonical Zobrist key) to a searched reply.
+
+    Shared by every game of the app; the lock only guards the dict
+    operations, so lookups from the event loop and stores from AI threads
+    can interleave safely.
+    """
+
+    capacity: int
+    hits: int
+    misses: int
+
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[int, int], TTEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, size: int, key: int) -> TTEntry | None:
+        with self._lock:
+            entry = self._entries.get((size, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((size, key))
+            self.hits += 1
+            return entry
+
+    def put(self, size: int, key: int, entry: TTEntry):
+        with self._lock:
+            old = self._entries.get((size, key))
+            # keep the deeper search when two games race on one position
+            if old is not None and old.playouts > entry.playouts:
+                self._entries.move_to_end((size, key))
+                return
+            self._entries[(size, key)] = entry
+            self._entries.move_to_end((size, key))
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
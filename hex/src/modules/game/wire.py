@@ -0,0 +1,96 @@
+# builtin
+import struct
+
+# external
+
+# internal
+from .hex_game import HexGame
+from .geometry import geometry
+
+
+# Binary form of `HexGame.to_json_since`, served when a client sends
+# `Accept: application/x-hex-state`. All integers are little-endian.
+#
+#   header   kind (0 full, 1 delta), size, version, player (0 red, 1 blue),
+#            status (0 ok, 1 win, 2 invalid), winner (0 none, 1 red, 2 blue),
+#            moveNumber, lastMove cell + 1 (0 none), gameId length
+#   gameId   utf-8
+#   full     board at 2 bits per cell (0 empty, 1 red, 2 blue), cell i in
+#            bits 2*(i % 4) of byte i // 4; move count; one cell per move
+#   delta    since, movesRemoved; count + cells of movesAdded; count of
+#            changed cells, then (cell, stone) per change
+#
+# A cell is one byte on boards up to 16x16 and two bytes above that. Move
+# colors are not sent: every listed move's cell holds the mover's stone.
+MEDIA_TYPE = "application/x-hex-state"
+HEADER = struct.Struct("<BBIBBBHHB")
+DELTA = struct.Struct("<IH")
+
+PLAYERS = {"red": 0, "blue": 1}
+STATUSES = {"ok": 0, "win": 1, "invalid": 2}
+WINNERS = {"": 0, "red": 1, "blue": 2}
+STONES = {"0": 0, "R": 1, "B": 2}
+
+# byte -> its bits moved to the even positions of a 16-bit word
+_SPREAD = [sum((b >> k & 1) << 2 * k for k in range(8)) for b in range(256)]
+
+
+def pack_board(size: int, red: int, blue: int) -> bytes:
+    packed = 0
+    shift = 0
+    while red or blue:
+        packed |= (_SPREAD[red & 0xFF] | _SPREAD[blue & 0xFF] << 1) << shift
+        red >>= 8
+        blue >>= 8
+        shift += 16
+    return packed.to_bytes((size * size + 3) // 4, "little")
+
+
+def _cell_format(size: int) -> str:
+    return "B" if size * size <= 256 else "H"
+
+
+def _cells(size: int, labels: list[str]) -> bytes:
+    fmt = _cell_format(size)
+    index = geometry(size).cells
+    cells = [index[label] for label in labels]
+    return struct.pack(f"<H{len(cells)}{fmt}", len(cells), *cells)
+
+
+def encode_state(game: HexGame, version: int | None = None) -> bytes:
+    state = game.to_json_since(version)
+    delta = bool(state.get("delta"))
+    size = game.size
+    game_id = game.game_id.encode()
+    index = geometry(size).cells
+    last = state["lastMove"]
+    last_cell = index[last] + 1 if last else 0
+
+    parts = [
+        HEADER.pack(
+            delta,
+            size,
+            state["version"],
+            PLAYERS[state["player"]],
+            STATUSES[state["status"]],
+            WINNERS[state["winner"]],
+            state["moveNumber"],
+            last_cell,
+            len(game_id),
+        ),
+        game_id,
+    ]
+    if not delta:
+        parts.append(pack_board(size, game.bitboard.red, game.bitboard.blue))
+        parts.append(_cells(size, [m["move"] for m in state["moves"]]))
+    else:
+        parts.append(DELTA.pack(state["since"], state["movesRemoved"]))
+        parts.append(_cells(size, [m["move"] for m in state["movesAdded"]]))
+        changed = state["cells"]
+        fmt = "<" + (_cell_format(size) + "B") * len(changed)
+        flat = []
+        for label, stone in changed.items():
+            flat.append(index[label])
+            flat.append(STONES[stone])
+        parts.append(struct.pack("<H", len(changed)) + struct.pack(fmt, *flat))
+    return b"".join(parts)
@@ -0,0 +1,69 @@
+# builtin
+import random
+from functools import lru_cache
+
+# external
+
+# internal
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(n: int) -> tuple[list[int], list[int]]:
+    """64-bit (red, blue) keys per cell, identical in every process.
+
+    Seeded from the board size so hashes can be stored on disk and shared
+    between workers.
+    """
+    rng = random.Random(f"hex-zobrist-{n}")
+    red = [rng.getrandbits(64) for _ in range(n * n)]
+    blue = [rng.getrandbits(64) for _ in range(n * n)]
+    return red, blue
+
+
+class ZobristHash:
+    """Incremental hash of a position and of its 180 degree rotation.
+
+    Rotating the board by 180 degrees maps cell i to n*n - 1 - i and keeps
+    each color's pair of edges, so a position and its rotation are the same
+    game. Both hashes are kept in step and the smaller one is the canonical
+    key.
+    """
+
+    size: int
+    value: int
+    rotated: int
+
+    def __init__(self, size: int):
+        self.size = size
+        self.value = 0
+        self.rotated = 0
+        self._red, self._blue = zobrist_keys(size)
+        self._last = size * size - 1
+
+    def toggle(self, cell: int, player: str):
+        keys = self._red if player == "red" else self._blue
+        self.value ^= keys[cell]
+        self.rotated ^= keys[self._last - cell]
+
+    def canonical(self) -> tuple[int, bool]:
+        """The canonical key and whether it is the rotated one."""
+        if self.rotated < self.value:
+            return self.rotated, True
+        return self.value, False
+
+    def rotate_cell(self, cell: int) -> int:
+        return self._last - cell
+
+    @classmethod
+    def of(cls, size: int, red: int, blue: int) -> "ZobristHash":
+        h = cls(size)
+        cell = 0
+        while red or blue:
+            if red & 1:
+                h.toggle(cell, "red")
+            elif blue & 1:
+                h.toggle(cell, "blue")
+            red >>= 1
+            blue >>= 1
+            cell += 1
+        return h
@@ -0,0 +1,5 @@
+from .cold import ColdStore, FileColdStore, SqliteColdStore
+from .game_queues import GameQueues
+from .game_store import GameStore, MemoryGameStore, TieredGameStore, lookup_game, sweep_idle_games
+from .registry import GameIdAllocator, GameRegistry, create_game_store
+from .shared import SharedGameStore
@@ -0,0 +1,89 @@
+# builtin
+import json
+import os
+import sqlite3
+import threading
+
+# external
+
+# internal
+
+
+class ColdStore:
+    """Where idle games are parked as `HexGame.to_record()` dicts."""
+
+    def load(self, game_id: str) -> dict | None:
+        raise NotImplementedError
+
+    def save_many(self, records: list[dict]):
+        raise NotImplementedError
+
+    def contains(self, game_id: str) -> bool:
+        return self.load(game_id) is not None
+
+    def close(self):
+        pass
+
+
+class SqliteColdStore(ColdStore):
+    path: str
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS games (game_id TEXT PRIMARY KEY, record TEXT NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def load(self, game_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT record FROM games WHERE game_id = ?", (game_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_many(self, records: list[dict]):
+        if not records:
+            return
+        rows = [(r["gameId"], json.dumps(r, separators=(",", ":"))) for r in records]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO games (game_id, record) VALUES (?, ?)", rows)
+
+    def contains(self, game_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM games WHERE game_id = ?", (game_id,)).fetchone() is not None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class FileColdStore(ColdStore):
+    """One JSON file per game; fine for small deployments and easy to inspect."""
+
+    directory: str
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, game_id: str) -> str:
+        # ids come from clients on lookups; never let them leave the directory
+        return os.path.join(self.directory, os.path.basename(game_id) + ".json")
+
+    def load(self, game_id: str) -> dict | None:
+        try:
+            with open(self._path(game_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_many(self, records: list[dict]):
+        for record in records:
+            path = self._path(record["gameId"])
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(record, f, separators=(",", ":"))
+            os.replace(path + ".tmp", path)
+
+    def contains(self, game_id: str) -> bool:
+        return os.path.exists(self._path(game_id))
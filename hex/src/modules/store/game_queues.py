@@ -0,0 +1,92 @@
+# builtin
+import asyncio
+from contextlib import asynccontextmanager
+
+# external
+
+# internal
+from .game_store import GameStore
+
+
+# how often a command waiting on another worker's lease checks again
+LEASE_POLL = 0.005
+
+
+class GameQueues:
+    """Runs the commands for one game one at a time, in arrival order.
+
+    Each game with pending commands gets its own asyncio.Lock (FIFO), so
+    games never wait on each other; the lock is dropped as soon as the
+    game's queue drains. Meant for the server's event loop only.
+
+    Given a `store`, each command also holds the game there (`acquire` /
+    `release`): the store keeps the game resident until the command ends,
+    and a store shared with other processes leases it so commands arriving
+    at different workers still run one at a time, its lease renewed for as
+    long as the command runs. A `blocking` store is
+    called from a thread, so waiting on its disk or on another worker never
+    stalls the event loop.
+    """
+
+    def __init__(self, store: GameStore | None = None):
+        self._store = store
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._depth: dict[str, int] = {}
+
+    @asynccontextmanager
+    async def turn(self, game_id: str):
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        self._depth[game_id] = self._depth.get(game_id, 0) + 1
+        try:
+            async with lock:
+                if self._store is None:
+                    yield
+                    return
+                while not await self._call(self._store.acquire, game_id):
+                    await asyncio.sleep(LEASE_POLL)
+                done = asyncio.Event()
+                heartbeat = asyncio.create_task(self._renew(game_id, done)) if self._store.lease_ttl else None
+                try:
+                    yield
+                finally:
+                    if heartbeat is not None:
+                        # let a renewal in flight land first, or it would
+                        # re-take the lease after the release
+                        done.set()
+                        await heartbeat
+                    await self._call(self._store.release, game_id)
+        finally:
+            self._depth[game_id] -= 1
+            if not self._depth[game_id]:
+                del self._depth[game_id]
+                del self._locks[game_id]
+
+    async def _renew(self, game_id: str, done: asyncio.Event):
+        # an AI search can outlast a lease; renewing well inside it keeps
+        # other workers off the game until the command ends
+        while True:
+            try:
+                await asyncio.wait_for(done.wait(), self._store.lease_ttl / 3)
+                return
+            except TimeoutError:
+                await self._call(self._store.renew, game_id)
+
+    async def _call(self, method, game_id: str):
+        if self._store.blocking:
+            return await asyncio.to_thread(method, game_id)
+        return method(game_id)
+
+    def depth(self, game_id: str) -> int:
+        """Commands running or waiting for `game_id`."""
+        return self._depth.get(game_id, 0)
+
+    def stats(self, top: int = 10) -> dict:
+        deepest = sorted(self._depth.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            "activeGames": len(self._depth),
+            "pending": sum(self._depth.values()),
+            "maxDepth": deepest[0][1] if deepest else 0,
+            "deepest": dict(deepest),
+        }
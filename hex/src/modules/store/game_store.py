@@ -0,0 +1,278 @@
+# builtin
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+# external
+
+# internal
+from ..game.hex_game import HexGame
+from .cold import ColdStore
+
+
+class GameStore:
+    """The mapping the routes use as `app.state.games`."""
+
+    # True when acquire / release / add_records may wait on disk or on other
+    # processes; callers on the event loop then run them in a thread
+    blocking = False
+    # seconds an `acquire` holds the game for other processes unless renewed;
+    # None when nothing outside this process can take it
+    lease_ttl: float | None = None
+
+    def get(self, game_id: str) -> HexGame | None:
+        raise NotImplementedError
+
+    def __setitem__(self, game_id: str, game: HexGame):
+        raise NotImplementedError
+
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def add_records(self, records: list[dict]):
+        """Register games given as `HexGame.to_record()` dicts, e.g. bulk imports."""
+        for record in records:
+            self[record["gameId"]] = HexGame.from_record(record)
+
+    def acquire(self, game_id: str) -> bool:
+        """Claim `game_id` for one command; False while another process holds it."""
+        return True
+
+    def renew(self, game_id: str):
+        """Extend the lease taken by `acquire` while its command is still running."""
+
+    def release(self, game_id: str):
+        """End the command started by `acquire`, publishing what it changed."""
+
+    def evict_idle(self) -> int:
+        return 0
+
+    def close(self):
+        pass
+
+
+class MemoryGameStore(GameStore):
+    """Every game stays resident, as before the store existed."""
+
+    def __init__(self):
+        self._games: dict[str, HexGame] = {}
+
+    def get(self, game_id: str) -> HexGame | None:
+        return self._games.get(game_id)
+
+    def __setitem__(self, game_id: str, game: HexGame):
+        self._games[game_id] = game
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+
+class TieredGameStore(GameStore):
+    """Hot LRU of live HexGame objects in front of a cold store of records.
+
+    Games untouched for `idle_ttl` seconds, or pushed out when more than
+    `hot_capacity` are resident, are serialized to the cold tier and
+    rebuilt on their next lookup. A game with a command in flight (between
+    `acquire` and `release`) is never spilled: the command may still be
+    awaiting the AI and would otherwise finish on an orphaned object.
+
+    The cold tier is disk, so the store is `blocking`: `acquire` loads the
+    game before its command starts and spills happen in `release` and
+    `evict_idle`, all called from a thread. Lookups and stores made inside
+    a command never touch the disk.
+    """
+
+    blocking = True
+
+    cold: ColdStore
+    hot_capacity: int
+    idle_ttl: float
+
+    def __init__(
+        self,
+        cold: ColdStore,
+        hot_capacity: int = 10_000,
+        idle_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cold = cold
+        self.hot_capacity = hot_capacity
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        # guards everything below; never held across cold-tier I/O
+        self._lock = threading.Lock()
+        # one spill written at a time, so a game's records land in order
+        self._write_lock = threading.Lock()
+        # least recently used first, so idle games are always at the front
+        self._hot: OrderedDict[str, tuple[HexGame, float]] = OrderedDict()
+        # game id -> commands in flight
+        self._pins: dict[str, int] = {}
+        # held games `acquire` found in neither tier (ids about to be created
+        # or that a client made up), so lookups inside the command skip the disk
+        self._missing: set[str] = set()
+        # game id -> record taken out of _hot but not yet written; lookups
+        # rebuild from it rather than read the older copy on disk
+        self._spilling: dict[str, dict] = {}
+        # bumped by every write, so a load that raced one can tell
+        self._writes = 0
+
+    def _cached(self, game_id: str) -> HexGame | None:
+        # caller holds _lock
+        entry = self._hot.get(game_id)
+        if entry is not None:
+            self._hot[game_id] = (entry[0], self._clock())
+            self._hot.move_to_end(game_id)
+            return entry[0]
+        record = self._spilling.get(game_id)
+        if record is None:
+            return None
+        game = HexGame.from_record(record)
+        self._hot[game_id] = (game, self._clock())
+        return game
+
+    def _load(self, game_id: str) -> HexGame | None:
+        while True:
+            with self._lock:
+                game = self._cached(game_id)
+                if game is not None:
+                    return game
+                writes = self._writes
+            record = self.cold.load(game_id)
+            with self._lock:
+                game = self._cached(game_id)
+                if game is not None:
+                    return game
+                if self._writes != writes:
+                    # a spill landed meanwhile and may have been this game
+                    continue
+                if record is None:
+                    return None
+                game = HexGame.from_record(record)
+                self._hot[game_id] = (game, self._clock())
+                break
+        self._spill_excess()
+        return game
+
+    def get(self, game_id: str) -> HexGame | None:
+        with self._lock:
+            game = self._cached(game_id)
+            if game is not None or game_id in self._missing:
+                return game
+        return self._load(game_id)
+
+    def __setitem__(self, game_id: str, game: HexGame):
+        # spilled, if over capacity, when the command releases it
+        with self._lock:
+            self._hot[game_id] = (game, self._clock())
+            self._hot.move_to_end(game_id)
+            self._missing.discard(game_id)
+
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._hot)
+
+    def add_records(self, records: list[dict]):
+        # straight to the cold tier in one batch; each game is rebuilt on
+        # its first lookup like any other parked game
+        self.cold.save_many(records)
+        with self._lock:
+            self._writes += 1
+
+    def acquire(self, game_id: str) -> bool:
+        with self._lock:
+            self._pins[game_id] = self._pins.get(game_id, 0) + 1
+        if self._load(game_id) is None:
+            with self._lock:
+                if game_id not in self._hot:
+                    self._missing.add(game_id)
+        return True
+
+    def release(self, game_id: str):
+        with self._lock:
+            self._pins[game_id] -= 1
+            if not self._pins[game_id]:
+                del self._pins[game_id]
+                self._missing.discard(game_id)
+        self._spill_excess()
+
+    def _spill(self, game_ids: list[str]):
+        # caller holds _lock for the pop, not for the write
+        records = []
+        for game_id in game_ids:
+            record = self._hot.pop(game_id)[0].to_record()
+            self._spilling[game_id] = record
+            records.append(record)
+        return records
+
+    def _write(self, records: list[dict]):
+        if not records:
+            return
+        with self._write_lock:
+            with self._lock:
+                # skip games spilled again since; the newer record is queued
+                records = [r for r in records if self._spilling.get(r["gameId"]) is r]
+            self.cold.save_many(records)
+            with self._lock:
+                self._writes += 1
+                for record in records:
+                    if self._spilling.get(record["gameId"]) is record:
+                        del self._spilling[record["gameId"]]
+
+    def _spill_excess(self):
+        with self._lock:
+            excess = len(self._hot) - self.hot_capacity
+            # least recently used first, stepping over pinned games
+            unpinned = (game_id for game_id in self._hot if game_id not in self._pins)
+            records = self._spill(list(itertools.islice(unpinned, max(0, excess))))
+        self._write(records)
+
+    def evict_idle(self) -> int:
+        cutoff = self._clock() - self.idle_ttl
+        idle = []
+        with self._lock:
+            for game_id, (_, last_used) in self._hot.items():
+                if last_used > cutoff:
+                    break
+                if game_id not in self._pins:
+                    idle.append(game_id)
+            records = self._spill(idle)
+        self._write(records)
+        return len(idle)
+
+    def close(self):
+        with self._lock:
+            records = self._spill(list(self._hot))
+        self._write(records)
+        self.cold.close()
+
+
+async def lookup_game(store: GameStore, game_id: str) -> HexGame | None:
+    """`store.get` for routes that only read a game, outside any command.
+
+    A `blocking` store may have to load the game from disk, so it is asked
+    from a thread.
+    """
+    if store.blocking:
+        return await asyncio.to_thread(store.get, game_id)
+    return store.get(game_id)
+
+
+async def sweep_idle_games(store: GameStore, interval: float):
+    """Background task: periodically move idle games to the cold tier."""
+    while True:
+        await asyncio.sleep(interval)
+        if store.blocking:
+            await asyncio.to_thread(store.evict_idle)
+        else:
+            store.evict_idle()
@@ -0,0 +1,154 @@
+# builtin
+import contextlib
+import itertools
+import os
+import secrets
+import threading
+import zlib
+
+# external
+
+# internal
+from ..game.hex_game import HexGame
+from .cold import FileColdStore, SqliteColdStore
+from .game_store import GameStore, MemoryGameStore, TieredGameStore
+from .shared import SharedGameStore
+
+
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def base62(value: int, width: int = 0) -> str:
+    digits = []
+    while value:
+        value, rem = divmod(value, 62)
+        digits.append(ALPHABET[rem])
+    return "".join(reversed(digits)).rjust(width, "0")
+
+
+class GameIdAllocator:
+    """Compact, URL-safe ids: "g" + 7 chars of random node id + a base62 counter.
+
+    The counter makes ids unique within a process without any lookup; the
+    40-bit node id, drawn once per process, keeps processes and restarts
+    apart (a clash needs two processes to draw the same node id).
+    """
+
+    node: str
+
+    def __init__(self, node: int | None = None):
+        self.node = base62(node if node is not None else secrets.randbits(40), 7)
+        # next() on itertools.count is atomic under the GIL
+        self._counter = itertools.count(1)
+
+    def allocate(self) -> str:
+        return "g" + self.node + base62(next(self._counter))
+
+
+class GameRegistry(GameStore):
+    """Allocates game ids and spreads games over independently locked shards.
+
+    A lookup hashes the id to one shard and only takes that shard's lock,
+    so creations and moves on different games rarely contend.
+    """
+
+    shards: list[GameStore]
+
+    def __init__(self, shards: list[GameStore], allocator: GameIdAllocator | None = None):
+        self.shards = shards
+        self.allocator = allocator or GameIdAllocator()
+        self._locks = [threading.Lock() for _ in shards]
+        self.blocking = any(shard.blocking for shard in shards)
+        self.lease_ttl = min((shard.lease_ttl for shard in shards if shard.lease_ttl), default=None)
+
+    def _shard(self, game_id: str) -> int:
+        return zlib.crc32(game_id.encode()) % len(self.shards)
+
+    def _held(self, i: int):
+        # a blocking shard locks for itself; holding the shard lock while it
+        # waits would stall every lookup on the shard behind it
+        return contextlib.nullcontext() if self.shards[i].blocking else self._locks[i]
+
+    def allocate_id(self) -> str:
+        return self.allocator.allocate()
+
+    def get(self, game_id: str) -> HexGame | None:
+        i = self._shard(game_id)
+        with self._held(i):
+            return self.shards[i].get(game_id)
+
+    def __setitem__(self, game_id: str, game: HexGame):
+        i = self._shard(game_id)
+        with self._held(i):
+            self.shards[i][game_id] = game
+
+    def __contains__(self, game_id: str) -> bool:
+        i = self._shard(game_id)
+        with self._held(i):
+            return game_id in self.shards[i]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    def add_records(self, records: list[dict]):
+        by_shard: dict[int, list[dict]] = {}
+        for record in records:
+            by_shard.setdefault(self._shard(record["gameId"]), []).append(record)
+        for i, shard_records in by_shard.items():
+            with self._held(i):
+                self.shards[i].add_records(shard_records)
+
+    def acquire(self, game_id: str) -> bool:
+        i = self._shard(game_id)
+        with self._held(i):
+            return self.shards[i].acquire(game_id)
+
+    def renew(self, game_id: str):
+        i = self._shard(game_id)
+        with self._held(i):
+            self.shards[i].renew(game_id)
+
+    def release(self, game_id: str):
+        i = self._shard(game_id)
+        with self._held(i):
+            self.shards[i].release(game_id)
+
+    def evict_idle(self) -> int:
+        count = 0
+        for i, shard in enumerate(self.shards):
+            with self._held(i):
+                count += shard.evict_idle()
+        return count
+
+    def close(self):
+        for i, shard in enumerate(self.shards):
+            with self._held(i):
+                shard.close()
+
+
+def create_game_store(
+    kind: str = "memory",
+    path: str | None = None,
+    hot_capacity: int = 10_000,
+    idle_ttl: float = 300.0,
+    shards: int = 16,
+) -> GameRegistry:
+    if kind == "memory":
+        return GameRegistry([MemoryGameStore() for _ in range(shards)])
+
+    # each shard gets its own connection / directory handle so cold loads on
+    # different shards do not queue behind each other
+    per_shard = max(1, hot_capacity // shards)
+    if kind == "sqlite":
+        path = path or "games.sqlite3"
+        return GameRegistry([TieredGameStore(SqliteColdStore(path), per_shard, idle_ttl) for _ in range(shards)])
+    if kind == "files":
+        path = path or "games"
+        return GameRegistry([TieredGameStore(FileColdStore(path), per_shard, idle_ttl) for _ in range(shards)])
+    if kind == "shared":
+        # one database for every worker process on the machine; the worker
+        # id is shared by this process's shards so its leases are its own
+        path = path or "games.sqlite3"
+        worker = f"{os.getpid()}-{secrets.token_hex(4)}"
+        return GameRegistry([SharedGameStore(path, worker, per_shard, idle_ttl) for _ in range(shards)])
+    raise ValueError(f"unknown game store {kind!r}")
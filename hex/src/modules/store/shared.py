@@ -0,0 +1,239 @@
+# builtin
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+# external
+
+# internal
+from ..game.hex_game import HexGame
+from .game_store import GameStore
+
+
+# version recorded for a game created here and not written yet
+UNSAVED = -1
+
+
+class LeaseLostError(RuntimeError):
+    """A command outlived its lease and another worker took the game over."""
+
+
+def _dump(game: HexGame) -> str:
+    return json.dumps(game.to_record(), separators=(",", ":"))
+
+
+class SharedGameStore(GameStore):
+    """Games shared by every worker process through one SQLite database in WAL mode.
+
+    The database is the source of truth; each worker keeps the games it has
+    served recently as live objects. A lookup reads only the stored version
+    and reuses the local object when it is current, so a game that keeps
+    hitting the same worker (a WebSocket, a keep-alive connection) never
+    leaves the process. Commands hold a short lease on the game row, renewed
+    while they run, so two workers cannot interleave on one game, and write
+    the record back when they release it; a game stays resident while a
+    command holds it.
+
+    `acquire` and `release` write and may wait on other workers, so they
+    are meant to run off the event loop (`blocking`); lookups only read,
+    which WAL never makes wait on a writer. Reads and writes use separate
+    connections so a lookup never queues behind a write.
+    """
+
+    blocking = True
+
+    path: str
+    worker: str
+    hot_capacity: int
+    idle_ttl: float
+    lease_ttl: float
+
+    def __init__(
+        self,
+        path: str,
+        worker: str | None = None,
+        hot_capacity: int = 10_000,
+        idle_ttl: float = 300.0,
+        lease_ttl: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.worker = worker or f"{os.getpid()}-{secrets.token_hex(4)}"
+        self.hot_capacity = hot_capacity
+        self.idle_ttl = idle_ttl
+        self.lease_ttl = lease_ttl
+        self._clock = clock
+        # autocommit: every statement is its own short transaction
+        self._writer = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.execute(
+            "CREATE TABLE IF NOT EXISTS shared_games ("
+            "game_id TEXT PRIMARY KEY, version INTEGER NOT NULL, record TEXT NOT NULL,"
+            " owner TEXT, lease_until REAL NOT NULL DEFAULT 0)"
+        )
+        self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        # guards _hot and _pins only; never held across a statement
+        self._lock = threading.Lock()
+        # game id -> (game, version last written, last used), least recent first
+        self._hot: OrderedDict[str, tuple[HexGame, int, float]] = OrderedDict()
+        # game id -> commands in flight; these games are never dropped
+        self._pins: dict[str, int] = {}
+
+    def _read(self, sql: str, game_id: str):
+        with self._read_lock:
+            return self._reader.execute(sql, (game_id,)).fetchone()
+
+    def _keep(self, game: HexGame, version: int):
+        with self._lock:
+            self._hot[game.game_id] = (game, version, self._clock())
+            self._hot.move_to_end(game.game_id)
+            excess = len(self._hot) - self.hot_capacity
+            if excess > 0:
+                # unpinned games are already written back; the next lookup reloads them
+                for game_id in [g for g in self._hot if g not in self._pins][:excess]:
+                    del self._hot[game_id]
+
+    def get(self, game_id: str) -> HexGame | None:
+        with self._lock:
+            entry = self._hot.get(game_id)
+            if entry is not None and entry[1] == UNSAVED:
+                # created by a command still in flight
+                return entry[0]
+
+        row = self._read("SELECT version FROM shared_games WHERE game_id = ?", game_id)
+        if row is None:
+            with self._lock:
+                if game_id not in self._pins:
+                    self._hot.pop(game_id, None)
+            return None
+        if entry is not None and entry[1] == row[0]:
+            with self._lock:
+                if game_id in self._hot:
+                    self._hot[game_id] = (entry[0], entry[1], self._clock())
+                    self._hot.move_to_end(game_id)
+            return entry[0]
+
+        # another worker moved the game on since we last saw it
+        row = self._read("SELECT record FROM shared_games WHERE game_id = ?", game_id)
+        if row is None:
+            return None
+        game = HexGame.from_record(json.loads(row[0]))
+        self._keep(game, game.version)
+        return game
+
+    def __setitem__(self, game_id: str, game: HexGame):
+        with self._lock:
+            pinned = game_id in self._pins
+        if pinned:
+            # written by `release` when the command creating it ends
+            self._keep(game, UNSAVED)
+            return
+        with self._write_lock:
+            self._writer.execute(
+                "INSERT INTO shared_games (game_id, version, record) VALUES (?, ?, ?)"
+                " ON CONFLICT (game_id) DO UPDATE SET version = excluded.version, record = excluded.record",
+                (game_id, game.version, _dump(game)),
+            )
+        self._keep(game, game.version)
+
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._hot)
+
+    def add_records(self, records: list[dict]):
+        rows = [(r["gameId"], r.get("version", 0), json.dumps(r, separators=(",", ":"))) for r in records]
+        with self._write_lock:
+            self._writer.executemany("INSERT OR REPLACE INTO shared_games (game_id, version, record) VALUES (?, ?, ?)", rows)
+
+    def acquire(self, game_id: str) -> bool:
+        now = self._clock()
+        with self._write_lock:
+            cursor = self._writer.execute(
+                "UPDATE shared_games SET owner = ?, lease_until = ?"
+                " WHERE game_id = ? AND (owner = ? OR lease_until < ?)",
+                (self.worker, now + self.lease_ttl, game_id, self.worker, now),
+            )
+            # an unknown game has nothing to protect: it is about to be
+            # created, or the route reports it
+            ok = cursor.rowcount > 0 or self._writer.execute(
+                "SELECT 1 FROM shared_games WHERE game_id = ?", (game_id,)
+            ).fetchone() is None
+        if ok:
+            with self._lock:
+                self._pins[game_id] = self._pins.get(game_id, 0) + 1
+        return ok
+
+    def renew(self, game_id: str):
+        with self._write_lock:
+            self._writer.execute(
+                "UPDATE shared_games SET lease_until = ? WHERE game_id = ? AND owner = ?",
+                (self._clock() + self.lease_ttl, game_id, self.worker),
+            )
+
+    def release(self, game_id: str):
+        with self._lock:
+            self._pins[game_id] -= 1
+            if not self._pins[game_id]:
+                del self._pins[game_id]
+            entry = self._hot.get(game_id)
+        if entry is None or entry[0].version == entry[1]:
+            with self._write_lock:
+                self._writer.execute(
+                    "UPDATE shared_games SET lease_until = 0 WHERE game_id = ? AND owner = ?",
+                    (game_id, self.worker),
+                )
+            return
+
+        # the command has ended, so nothing changes the game while it is written
+        game = entry[0]
+        with self._write_lock:
+            if entry[1] == UNSAVED:
+                cursor = self._writer.execute(
+                    "INSERT INTO shared_games (game_id, version, record, owner, lease_until) VALUES (?, ?, ?, ?, 0)",
+                    (game_id, game.version, _dump(game), self.worker),
+                )
+            else:
+                cursor = self._writer.execute(
+                    "UPDATE shared_games SET version = ?, record = ?, lease_until = 0 WHERE game_id = ? AND owner = ?",
+                    (game.version, _dump(game), game_id, self.worker),
+                )
+        with self._lock:
+            if cursor.rowcount:
+                if game_id in self._hot:
+                    self._hot[game_id] = (game, game.version, entry[2])
+                return
+            # another worker took the game over; its copy wins and ours is
+            # reloaded on the next lookup
+            self._hot.pop(game_id, None)
+        raise LeaseLostError(f"lease on game {game_id} expired; its last command was not saved")
+
+    def evict_idle(self) -> int:
+        cutoff = self._clock() - self.idle_ttl
+        idle = []
+        with self._lock:
+            for game_id, (_, _, last_used) in self._hot.items():
+                if last_used > cutoff:
+                    break
+                if game_id not in self._pins:
+                    idle.append(game_id)
+            for game_id in idle:
+                del self._hot[game_id]
+        return len(idle)
+
+    def close(self):
+        with self._lock:
+            self._hot.clear()
+        with self._write_lock:
+            self._writer.close()
+        with self._read_lock:
+            self._reader.close()
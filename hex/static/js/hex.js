@@ -1,10 +1,116 @@
-const size = 11;
+let size = 11;
 let R = 20;
 let boardOffsetX = 0;
 let boardOffsetY = 0;
 let state = null;
 const myRole = "red";
 let locked = false;
+let socket = null;
+// Ask the server for the compact binary state encoding instead of JSON.
+const STATE_TYPE = "application/x-hex-state";
+const PLAYERS = ["red", "blue"];
+const STATUSES = ["ok", "win", "invalid"];
+const WINNERS = ["", "red", "blue"];
+const STONES = ["0", "R", "B"];
+
+// Column letters run A..Z, then AA, AB, ... on boards wider than 26.
+function cellLabel(row, col) {
+    let label = "";
+    for (let n = col + 1; n > 0; n = Math.floor((n - 1) / 26)) {
+        label = String.fromCharCode(65 + (n - 1) % 26) + label;
+    }
+    return label + (row + 1);
+}
+
+function parseLabel(label) {
+    const [, letters, digits] = label.match(/^([A-Z]+)(\d+)$/);
+    let col = 0;
+    for (const ch of letters) col = col * 26 + ch.charCodeAt(0) - 64;
+    return [parseInt(digits, 10) - 1, col - 1];
+}
+
+// Decodes the application/x-hex-state layout (see src/modules/game/wire.py)
+// into the same shape as the JSON responses.
+function decodeState(buffer) {
+    const view = new DataView(buffer);
+    let pos = 0;
+    const u8 = () => view.getUint8(pos++);
+    const u16 = () => { const v = view.getUint16(pos, true); pos += 2; return v; };
+    const u32 = () => { const v = view.getUint32(pos, true); pos += 4; return v; };
+
+    const delta = u8() === 1;
+    const n = u8();
+    const cell = n * n <= 256 ? u8 : u16;
+    const label = (i) => cellLabel(Math.floor(i / n), i % n);
+    const cells = (count) => Array.from({ length: count }, () => cell());
+    const next = {
+        version: u32(),
+        player: PLAYERS[u8()],
+        status: STATUSES[u8()],
+        winner: WINNERS[u8()],
+        moveNumber: u16(),
+    };
+    const last = u16();
+    next.lastMove = last ? label(last - 1) : "";
+    const idLength = u8();
+    next.gameId = new TextDecoder().decode(new Uint8Array(buffer, pos, idLength));
+    pos += idLength;
+
+    if (!delta) {
+        const packed = new Uint8Array(buffer, pos, Math.ceil(n * n / 4));
+        pos += packed.length;
+        const stone = (i) => STONES[(packed[i >> 2] >> ((i & 3) * 2)) & 3];
+        next.board = [];
+        for (let r = 0; r < n; r++) {
+            let row = "";
+            for (let c = 0; c < n; c++) row += stone(r * n + c);
+            next.board.push(row);
+        }
+        // a move's color is the stone on its cell
+        next.moves = cells(u16()).map((i) => ({ move: label(i), player: stone(i) }));
+        return next;
+    }
+
+    next.delta = true;
+    next.since = u32();
+    next.movesRemoved = u16();
+    const added = cells(u16());
+    next.cells = {};
+    const changed = u16();
+    for (let k = 0; k < changed; k++) {
+        const i = cell();
+        next.cells[label(i)] = STONES[u8()];
+    }
+    next.movesAdded = added.map((i) => ({ move: label(i), player: next.cells[label(i)] }));
+    return next;
+}
+
+async function readState(res) {
+    if ((res.headers.get("Content-Type") || "").startsWith(STATE_TYPE)) {
+        return decodeState(await res.arrayBuffer());
+    }
+    return res.json();
+}
+
+// Responses carry a full snapshot, or a delta against the version we sent
+// when the server still has the changes since then.
+function applyState(next) {
+    if (!next.delta) {
+        state = next;
+        size = state.board.length;
+        return;
+    }
+    state.moves.splice(state.moves.length - next.movesRemoved, next.movesRemoved);
+    state.moves.push(...next.movesAdded);
+    for (const [label, stone] of Object.entries(next.cells)) {
+        const [r, c] = parseLabel(label);
+        const row = state.board[r];
+        state.board[r] = row.slice(0, c) + stone + row.slice(c + 1);
+    }
+    for (const key of ["version", "player", "lastMove", "moveNumber", "status", "winner"]) {
+        state[key] = next[key];
+    }
+}
 
 function hexToPixel(row, col) {
     const x = col * (Math.sqrt(3) * R) + row * (Math.sqrt(3) / 2 * R) + boardOffsetX;
@@ -82,7 +188,7 @@ function drawBoard(ctx) {
             const [x, y] = hexToPixel(r, c);
             const cell = state.board[r][c];
             const fill = cell === "R" ? "red" : cell === "B" ? "blue" : "white";
-            const highlight = (state.lastMove && state.lastMove === String.fromCharCode(65 + c) + (r + 1));
+            const highlight = (state.lastMove && state.lastMove === cellLabel(r, c));
             drawHex(ctx, x, y, fill, highlight);
         }
     }
@@ -119,12 +225,62 @@ function renderMoveHistory() {
     }
 }
 
+function renderState() {
+    document.getElementById("status").innerText = " Turn: " + state.player + " | Move: " + state.lastMove + " | Status: " + state.status;
+    drawBoard(document.getElementById("board").getContext("2d"));
+    renderMoveHistory();
+}
+
+function socketReady() {
+    return socket !== null && socket.readyState === WebSocket.OPEN;
+}
+
+// Moves, undo and resign go over the game's WebSocket when it is open; the
+// server pushes a state frame per change, including the AI reply once ready.
+function connectSocket() {
+    if (socket) socket.close();
+    const proto = location.protocol === "https:" ? "wss:" : "ws:";
+    const ws = new WebSocket(`${proto}//${location.host}/ws/${encodeURIComponent(state.gameId)}?format=binary`);
+    ws.binaryType = "arraybuffer";
+    ws.onmessage = (e) => {
+        const frame = typeof e.data === "string" ? JSON.parse(e.data) : decodeState(e.data);
+        if (frame.type === "error") {
+            locked = false;
+            alert("Request failed: " + frame.error);
+            return;
+        }
+        applyState(frame);
+        // stay locked while the AI is still thinking
+        locked = state.player !== myRole && state.status !== "win";
+        renderState();
+    };
+    ws.onclose = async () => {
+        if (socket !== ws) return;
+        socket = null;
+        // from here on every request goes over HTTP; a move sent just
+        // before the drop may have been played, so fetch where the game is
+        // (an empty replay changes nothing) before unlocking the board
+        if (!locked) return;
+        const res = await fetch('/replay-moves', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Accept': STATE_TYPE },
+            body: JSON.stringify({ gameId: state.gameId, moves: [], version: state.version })
+        }).catch(() => null);
+        if (res && res.ok) applyState(await readState(res));
+        locked = false;
+        renderState();
+    };
+    socket = ws;
+}
+
 async function startGame() {
-    const res = await fetch('/create-game', { method: 'POST' });
-    state = await res.json();
+    const res = await fetch('/create-game', { method: 'POST', headers: { 'Accept': STATE_TYPE } });
+    state = await readState(res);
+    size = state.board.length;
     document.getElementById("status").innerText = " Game started. Red goes first.";
     drawBoard(document.getElementById("board").getContext("2d"));
     renderMoveHistory();
+    connectSocket();
 }
 
 document.getElementById("board").addEventListener("click", async (e) => {
@@ -141,18 +297,20 @@ document.getElementById("board").addEventListener("click", async (e) => {
             if (d < bestDist) { bestDist = d; best = [r, c]; }
         }
     }
-    const move = String.fromCharCode(65 + best[1]) + (best[0] + 1);
+    const move = cellLabel(best[0], best[1]);
+    if (socketReady()) {
+        socket.send(JSON.stringify({ type: "move", move: move, player: state.player }));
+        return;
+    }
     const res = await fetch('/submit-move', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ gameId: state.gameId, move: move, player: state.player })
+        headers: { 'Content-Type': 'application/json', 'Accept': STATE_TYPE },
+        body: JSON.stringify({ gameId: state.gameId, move: move, player: state.player, version: state.version })
     });
-    state = await res.json();
+    applyState(await readState(res));
     console.log(state);
     locked = false;
-    document.getElementById("status").innerText = " Turn: " + state.player + " | Move: " + state.lastMove + " | Status: " + state.status;
-    drawBoard(document.getElementById("board").getContext("2d"));
-    renderMoveHistory();
+    renderState();
 });
 
 document.getElementById("downloadMovesBtn").addEventListener("click", async () => {
@@ -177,20 +335,42 @@ document.getElementById("downloadMovesBtn").addEventListener("click", async () =
 // Generated from PS1-Q2
 document.getElementById("undoBtn").addEventListener("click", async () => {
     if (!state || !state.gameId) return;
+    if (socketReady()) {
+        socket.send(JSON.stringify({ type: "undo" }));
+        return;
+    }
     const res = await fetch('/undo-move', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ gameId: state.gameId })
+        headers: { 'Content-Type': 'application/json', 'Accept': STATE_TYPE },
+        body: JSON.stringify({ gameId: state.gameId, version: state.version })
     });
     if (!res.ok) {
         const err = await res.json().catch(() => ({ error: 'undo failed' }));
         alert("Undo failed: " + (err.error || res.statusText));
         return;
     }
-    state = await res.json();
-    document.getElementById("status").innerText = " Turn: " + state.player + " | Move: " + state.lastMove + " | Status: " + state.status;
-    drawBoard(document.getElementById("board").getContext("2d"));
-    renderMoveHistory();
+    applyState(await readState(res));
+    renderState();
+});
+
+document.getElementById("redoBtn").addEventListener("click", async () => {
+    if (!state || !state.gameId) return;
+    if (socketReady()) {
+        socket.send(JSON.stringify({ type: "redo" }));
+        return;
+    }
+    const res = await fetch('/redo-move', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': STATE_TYPE },
+        body: JSON.stringify({ gameId: state.gameId, version: state.version })
+    });
+    if (!res.ok) {
+        const err = await res.json().catch(() => ({ error: 'redo failed' }));
+        alert("Redo failed: " + (err.error || res.statusText));
+        return;
+    }
+    applyState(await readState(res));
+    renderState();
 });
 
 startGame();
\ No newline at end of file